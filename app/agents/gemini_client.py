@@ -1,21 +1,56 @@
-import json
+import functools
+import hashlib
+import logging
 import os
+import random
+import threading
+import time
 from types import SimpleNamespace
 
 from dotenv import load_dotenv
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+
+from .utils.json_utils import dumps
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Gemini Configuration
 # Use GEMINI_API_KEY in .env (or GOOGLE_API_KEY as fallback for compatibility with gemini_config)
 # Text + function calling uses generateContent — do not use *-live-* model IDs here; those are
 # Live API only (see gemini_config.MODEL and client.live / bidi sessions).
 model = os.environ.get("GEMINI_TEXT_MODEL", "gemini-3-flash-preview")
+# Tool selection is a constrained choice over a fixed enum, so it can run on a smaller/faster
+# model (e.g. a flash-lite variant) than task extraction. Defaults to the text model.
+select_model = os.environ.get("GEMINI_SELECT_MODEL") or model
 api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
 
+# Parallel tool batches and think_batch can issue many requests at once; cap the number in flight
+# so a burst queues here instead of tripping the API's rate limits.
+max_concurrency = int(os.environ.get("GEMINI_MAX_CONCURRENCY", "8"))
+_request_slots = threading.BoundedSemaphore(max_concurrency)
+
+# Rate-limited (429) and overloaded (503) requests are retried with jittered exponential backoff
+max_retries = int(os.environ.get("GEMINI_MAX_RETRIES", "4"))
+_RETRYABLE_STATUS_CODES = frozenset({429, 503})
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 8.0
+
+# Explicit context caching of a request's static prefix (system instruction + tools), so a large
+# constant prompt is stored once server-side instead of being re-sent on every call. Gemini
+# already caches repeated prefixes implicitly; this guarantees it. Seconds; 0 disables it.
+context_cache_ttl = int(os.environ.get("GEMINI_CONTEXT_CACHE_TTL", "0"))
+# Caches are replaced this long before they expire so in-flight requests don't hit an expired one
+_CONTEXT_CACHE_REFRESH_MARGIN = 60
+# prefix digest -> (cached content name or None if creation failed, time.monotonic() deadline)
+_context_caches = {}
+_context_caches_lock = threading.Lock()
+# Status codes of a request whose cached content expired or was evicted early
+_CONTEXT_CACHE_MISS_STATUS_CODES = frozenset({400, 403, 404})
+
 
 def _messages_to_contents(messages):
     """Convert OpenAI-style messages to Gemini contents and optional system_instruction."""
@@ -64,7 +99,7 @@ _FUNCTION_CALLING_MODES = {
 }
 
 
-def call_gemini(messages, tools=None, tool_choice="any"):
+def call_gemini(messages, tools=None, tool_choice="any", model=None, cache_static_prefix=False):
     """
     Call Gemini (text generateContent) with the given messages and optional tools.
 
@@ -72,12 +107,16 @@ def call_gemini(messages, tools=None, tool_choice="any"):
         messages: List of dicts with "role" ("system"|"user"|"assistant") and "content".
         tools: Optional list of OpenAI-style tool definitions (type/function/parameters).
         tool_choice: "any" (force a tool call — legacy default), "auto" (model decides), or "none".
+        model: Optional model ID overriding the default text model for this call.
+        cache_static_prefix: Send the system instruction and tools through an explicit context
+            cache (when GEMINI_CONTEXT_CACHE_TTL is set). Only for prompts that are identical
+            across calls.
 
     Returns:
         GenerateContentResponse from the Gemini API.
     """
     client = get_gemini_client()
-    model_name = get_model_name()
+    model_name = model or get_model_name()
     contents, system_instruction = _messages_to_contents(messages)
     # Gemini API requires at least one content (user/model turn). If we only had a system
     # message, contents is empty — add a single user turn so the API accepts the request.
@@ -92,19 +131,81 @@ def call_gemini(messages, tools=None, tool_choice="any"):
         config_kw["tools"] = gemini_tools
         config_kw["tool_config"] = types.ToolConfig(function_calling_config=types.FunctionCallingConfig(mode=mode))  # type: ignore
 
+    if cache_static_prefix and context_cache_ttl > 0 and system_instruction:
+        cache_key, cache_name = _get_context_cache(client, model_name, config_kw, tools, tool_choice)
+        if cache_name:
+            try:
+                return _generate_content(
+                    client, model=model_name, contents=contents, config=types.GenerateContentConfig(cached_content=cache_name)
+                )
+            except errors.APIError as e:
+                if e.code not in _CONTEXT_CACHE_MISS_STATUS_CODES:
+                    raise
+                logger.warning("Gemini context cache %s rejected, sending the full prompt: %s", cache_name, e)
+                with _context_caches_lock:
+                    _context_caches.pop(cache_key, None)
+
     config = types.GenerateContentConfig(**config_kw) if config_kw else None
     if config:
-        response = client.models.generate_content(
-            model=model_name,
-            contents=contents,
-            config=config,
-        )
-    else:
-        response = client.models.generate_content(
-            model=model_name,
-            contents=contents,
-        )
-    return response
+        return _generate_content(client, model=model_name, contents=contents, config=config)
+    return _generate_content(client, model=model_name, contents=contents)
+
+
+def _get_context_cache(client, model_name, config_kw, tools, tool_choice):
+    """
+    Return (key, cached content name) for the static prefix in config_kw, creating the cache
+    when missing or close to expiry. The name is None if the cache could not be created; that
+    is remembered for one TTL so a failing cache doesn't cost an extra round-trip per call.
+    """
+    key = hashlib.blake2b(
+        dumps([model_name, config_kw["system_instruction"], tools, tool_choice], sort_keys=True).encode("utf-8"),
+        digest_size=16,
+    ).digest()
+    # Creation happens under the lock so concurrent callers don't each create a cache; it only
+    # runs once per TTL
+    with _context_caches_lock:
+        now = time.monotonic()
+        entry = _context_caches.get(key)
+        if entry is not None and entry[1] > now:
+            return key, entry[0]
+        try:
+            cache = client.caches.create(
+                model=model_name,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=config_kw["system_instruction"],
+                    tools=config_kw.get("tools"),
+                    tool_config=config_kw.get("tool_config"),
+                    ttl=f"{context_cache_ttl}s",
+                ),
+            )
+            name = cache.name
+            deadline = now + max(context_cache_ttl - _CONTEXT_CACHE_REFRESH_MARGIN, context_cache_ttl / 2)
+        except Exception as e:
+            logger.warning("Gemini context cache unavailable, sending the full prompt: %s", e)
+            name = None
+            deadline = now + context_cache_ttl
+        _context_caches[key] = (name, deadline)
+        return key, name
+
+
+def _generate_content(client, **kwargs):
+    """
+    Run generate_content while holding one of the shared request slots, retrying
+    rate-limited / overloaded responses with full-jitter exponential backoff.
+    """
+    attempt = 0
+    while True:
+        try:
+            with _request_slots:
+                return client.models.generate_content(**kwargs)
+        except errors.APIError as e:
+            if e.code not in _RETRYABLE_STATUS_CODES or attempt >= max_retries:
+                raise
+        # Back off outside the slot so waiting requests can use it
+        delay = random.uniform(0, min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * (2 ** attempt)))
+        attempt += 1
+        logger.warning("Gemini request throttled, retrying in %.2fs (attempt %d/%d)", delay, attempt, max_retries)
+        time.sleep(delay)
 
 
 def gemini_response_to_openai_like(response):
@@ -126,7 +227,7 @@ def gemini_response_to_openai_like(response):
                     name = getattr(fc, "name", None) or ""
                     args = getattr(fc, "args", None) or {}
                     if not isinstance(args, str):
-                        args = json.dumps(args) if args else "{}"
+                        args = dumps(args) if args else "{}"
                     tool_calls.append(
                         SimpleNamespace(
                             id=getattr(fc, "id", None) or f"call_{len(tool_calls)}",
@@ -143,7 +244,7 @@ def gemini_response_to_openai_like(response):
 
 def get_gemini_client():
     """
-    Get a configured Gemini client instance.
+    Get the shared Gemini client instance (created on first use).
 
     Returns:
         genai.Client: Configured client instance.
@@ -156,7 +257,13 @@ def get_gemini_client():
             "Missing GEMINI_API_KEY or GOOGLE_API_KEY environment variable. "
             "Set one of them in .env to use the Gemini API."
         )
-    return genai.Client(api_key=api_key)
+    return _get_cached_client(api_key)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_cached_client(key):
+    """Build the Gemini client once so every call reuses its HTTP connection pool."""
+    return genai.Client(api_key=key)
 
 
 def get_model_name():
@@ -1,70 +1,232 @@
 import logging
 import asyncio
+import functools
+import types
+from concurrent.futures import ThreadPoolExecutor
 
 from .select_tool_agent import SelectToolAgent
-import json
-
-from .tool_agents.get_tasks_tool_agent import GetTasksToolAgent
-from .tool_agents.create_tasks_tool_agent import CreateTasksToolAgent
-from .tool_agents.edit_tasks_tool_agent import EditTasksToolAgent
-from .tool_agents.delete_tasks_tool_agent import DeleteTasksToolAgent
-from .tool_agents.send_message_tool_agent import SendMessageToolAgent
-from .tool_agents.generate_response_tool_agent import GenerateResponseToolAgent
-from .utils.scratchpad_utils import check_if_already_processed, build_chat_history_from_scratchpad
+from .utils.scratchpad_utils import scan_scratchpad
 from .utils.text_utils import normalize_text
+from .utils.json_utils import loads, JSONDecodeError
+
+logger = logging.getLogger(__name__)
+
+# Keys a tool response must mention for the short-circuit check to pass. A JSON string
+# containing none of them cannot satisfy the predicate, so it is rejected without parsing.
+_SHORT_CIRCUIT_KEY_MARKERS = {
+    "get_tasks_tool": ('"tasks"', '"total_count"'),
+    "edit_tasks_tool": ('"success"',),
+    "delete_tasks_tool": ('"success"',),
+    "create_tasks_tool": ('"success"', '"status"'),
+}
+
+# create_tasks_tool statuses after which nothing is left to create for the current request
+_CREATE_TASKS_FINAL_STATUSES = frozenset({"all_tasks_created", "invalid_time"})
+
+
+def _tool_name(tool_call):
+    """Parse the selected tool name out of a select_tool call's JSON arguments."""
+    return loads(tool_call.function.arguments)["tool_name"]
+
+
+def _compact_chat_history(chat_history):
+    """
+    Drop an assistant message when the next message is the same assistant message (same tool name
+    and content), e.g. a tool re-run that returned an identical result. The selector only needs the
+    latest copy, and the repeated payload would otherwise be re-sent on every select call.
+    
+    Returns:
+        list: chat_history itself when nothing was dropped, otherwise a compacted copy
+    """
+    compacted = None
+    for idx in range(len(chat_history) - 1):
+        message, next_message = chat_history[idx], chat_history[idx + 1]
+        if (
+            message.get("role") == "assistant"
+            and next_message.get("role") == "assistant"
+            and message.get("name") == next_message.get("name")
+            and message.get("content") == next_message.get("content")
+        ):
+            if compacted is None:
+                compacted = chat_history[:idx]
+        elif compacted is not None:
+            compacted.append(message)
+    if compacted is None:
+        return chat_history
+    compacted.append(chat_history[-1])
+    return compacted
+
+
+def _is_parallel_safe(tool_agent):
+    """
+    Whether a tool agent declares (via a ``parallel_safe = True`` class attribute) that its calls are
+    independent of other tools in the same turn. Tools that write tasks stay sequential because they
+    read earlier results from chat_history (e.g. duplicate detection).
+    """
+    return getattr(tool_agent, "parallel_safe", False) is True
+
+
+def _discard_task(task):
+    """Cancel a task whose result is no longer needed, retrieving any error so it isn't reported as unhandled."""
+    task.cancel()
+    task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+
+def _raise_none_response(tool_name, response):
+    raise ValueError(f"Tool '{tool_name}' returned None - execution may have failed")
+
+
+# Exact response type -> handler returning the final text
+_RESPONSE_EXTRACTORS = {
+    str: lambda tool_name, response: response,
+    type(None): _raise_none_response,
+}
+
+
+def _extract_response_text(tool_name, response):
+    """
+    Get the final text from a tool response. generate_response_tool returns a string directly,
+    other tools return ChatCompletion-like objects.
+    """
+    extractor = _RESPONSE_EXTRACTORS.get(type(response))
+    if extractor is not None:
+        return extractor(tool_name, response)
+    choices = getattr(response, "choices", None)
+    if choices:
+        return choices[0].message.content
+    raise ValueError(f"Invalid response from tool '{tool_name}': {response}")
+
+
+@functools.cache
+def _create_tool_agents():
+    """
+    Import and construct the tool agents on first use, as a read-only map keyed by tool name.
+    
+    The tool agent modules pull in the database, Service Bus and Gemini SDKs, so they are only
+    loaded once an agent is actually built. Tool agents are stateless and shared between instances.
+    """
+    from .tool_agents.get_tasks_tool_agent import GetTasksToolAgent
+    from .tool_agents.create_tasks_tool_agent import CreateTasksToolAgent
+    from .tool_agents.edit_tasks_tool_agent import EditTasksToolAgent
+    from .tool_agents.delete_tasks_tool_agent import DeleteTasksToolAgent
+    from .tool_agents.send_message_tool_agent import SendMessageToolAgent
+    from .tool_agents.generate_response_tool_agent import GenerateResponseToolAgent
+    agents = (GetTasksToolAgent(), CreateTasksToolAgent(), EditTasksToolAgent(), DeleteTasksToolAgent(), SendMessageToolAgent(), GenerateResponseToolAgent())
+    return _tool_agent_map(agents)
+
+
+def _tool_agent_map(tool_agents):
+    """Build a read-only tool name -> tool agent map from an iterable of tool agents."""
+    return types.MappingProxyType({tool_agent.get_tool_name(): tool_agent for tool_agent in tool_agents})
 
 class GeneralThinkingAgent:
-    tool_agents = {}
-    def __init__(self):
-        agents = [GetTasksToolAgent(), CreateTasksToolAgent(), EditTasksToolAgent(), DeleteTasksToolAgent(), SendMessageToolAgent(), GenerateResponseToolAgent()]
-        for tool_agent in agents:
-            self.tool_agents[tool_agent.get_tool_name()] = tool_agent
+    # Maximum number of scratchpad-derived messages kept in chat_history (override per user
+    # with user_config["chat_history_window"])
+    CHAT_HISTORY_WINDOW = 50
+
+    # Tool call limits per think() turn
+    MAX_TOTAL_TOOL_CALLS = 10
+    MAX_CONSECUTIVE_SAME_TOOL = 3
+
+    # tool_name -> predicate over the parsed tool response; True means generate_response_tool can run next
+    _SHORT_CIRCUIT_PREDICATES = {
+        # get_tasks_tool always returns a valid response (even if empty)
+        "get_tasks_tool": lambda parsed: "tasks" in parsed or "total_count" in parsed,
+        "edit_tasks_tool": lambda parsed: parsed.get("success") is True,
+        "delete_tasks_tool": lambda parsed: parsed.get("success") is True,
+        "create_tasks_tool": lambda parsed: parsed.get("success") is True or parsed.get("status") in _CREATE_TASKS_FINAL_STATUSES,
+    }
+
+    def __init__(self, tool_agents=None, speculative_generate_response=False):
+        """
+        Args:
+            tool_agents: Optional iterable of pre-built tool agents to use instead of the default
+                set, so callers can share tool agent objects between GeneralThinkingAgents
+            speculative_generate_response: Start generate_response_tool alongside the next select
+                call when the tools that just ran look finished. Lowers latency when the guess is
+                right, at the cost of a discarded model call when it is wrong.
+        """
+        self.speculative_generate_response = speculative_generate_response
+        # Read-only, so the default registry can be shared by every instance without one
+        # agent's changes leaking into another
+        self.tool_agents = _create_tool_agents() if tool_agents is None else _tool_agent_map(tool_agents)
+        # Built on first use and reused across think() calls; rebuilt if tool_agents is swapped out
+        self._select_tool_agent = None
+        self._select_tool_agent_tools = None
+
+    def _get_select_tool_agent(self):
+        """Return the SelectToolAgent for the current tool_agents, creating it on first use."""
+        if self._select_tool_agent is None or self._select_tool_agent_tools is not self.tool_agents:
+            self._select_tool_agent = SelectToolAgent(self.tool_agents)
+            self._select_tool_agent_tools = self.tool_agents
+        return self._select_tool_agent
+
+    def _resolve_tool(self, tool_name):
+        """
+        Look up the agent for a selected tool name (a single dict probe on the happy path).
+        
+        Returns:
+            The tool agent, or None if the name is unknown and should be skipped
+        
+        Raises:
+            ValueError: If the model returned the selector's own function name
+        """
+        try:
+            return self.tool_agents[tool_name]
+        except KeyError:
+            pass
+        if "select_tool" in tool_name.lower():
+            raise ValueError(f"Invalid tool name '{tool_name}'. The model incorrectly returned the selector function name. Available tools are: {list(self.tool_agents)}. Please check the select_tool_agent prompt.")
+        logger.warning("⚠️ Skipping invalid tool '%s' in tool call response", tool_name)
+        return None
 
-    def _extract_tool_names_from_response(self, selected_tool_response, context=""):
+    def _extract_tools_from_response(self, selected_tool_response, context=""):
         """
-        Extract tool names from a tool selection response, handling single or multiple tool calls uniformly.
+        Extract tools from a tool selection response, handling single or multiple tool calls uniformly.
         
         Args:
             selected_tool_response: The response from select_tool_agent
             context: Optional context string for logging (e.g., "loop", "initial")
         
         Returns:
-            list: List of tool names to execute
+            list: (tool_name, tool_agent) pairs to execute, resolved once against tool_agents
         """
         # Validate response structure
-        if not selected_tool_response.choices or not selected_tool_response.choices[0].message.tool_calls:
+        choices = selected_tool_response.choices
+        message = choices[0].message if choices else None
+        tool_calls = message.tool_calls if message is not None else None
+        if not tool_calls:
             context_msg = f" in {context}" if context else ""
-            print(f"Error: No tool_calls in response{context_msg}. Response structure: {selected_tool_response}")
-            raise ValueError(f"No tool_calls found in response{context_msg}. Message content: {selected_tool_response.choices[0].message.content if selected_tool_response.choices else 'No choices'}")
+            logger.error("Error: No tool_calls in response%s. Response structure: %s", context_msg, selected_tool_response)
+            raise ValueError(f"No tool_calls found in response{context_msg}. Message content: {message.content if message is not None else 'No choices'}")
         
         # Extract all tool names uniformly
         try:
-            tool_calls = selected_tool_response.choices[0].message.tool_calls
-            tool_names = []
+            tools = []
             
-            for idx, tool_call in enumerate(tool_calls):
-                tool_name = json.loads(tool_call.function.arguments)["tool_name"]
-                if tool_name not in self.tool_agents:
-                    print(f"⚠️ Skipping invalid tool '{tool_name}' in tool call response")
-                    continue
-                tool_names.append(tool_name)
+            for tool_call in tool_calls:
+                tool_name = _tool_name(tool_call)
+                tool_agent = self._resolve_tool(tool_name)
+                if tool_agent is not None:
+                    tools.append((tool_name, tool_agent))
             
+            tool_names = [tool_name for tool_name, _ in tools]
             if len(tool_names) > 1:
                 context_msg = f" ({context})" if context else ""
-                print(f"⚠️ Multiple tool calls detected ({len(tool_names)}){context_msg}: {tool_names}")
+                logger.info("⚠️ Multiple tool calls detected (%d)%s: %s", len(tool_names), context_msg, tool_names)
             else:
-                print(f"Tool call function name: {tool_calls[0].function.name}")
-                print(f"Tool call arguments: {tool_calls[0].function.arguments}")
-                print(f"Selected tool: {tool_names[0] if tool_names else 'N/A'}")
+                logger.debug("Tool call function name: %s", tool_calls[0].function.name)
+                logger.debug("Tool call arguments: %s", tool_calls[0].function.arguments)
+                logger.info("Selected tool: %s", tool_names[0] if tool_names else 'N/A')
             
-            if not tool_names:
+            if not tools:
                 raise ValueError("No valid tool names found in response")
             
-            return tool_names
+            return tools
             
-        except (KeyError, json.JSONDecodeError, AttributeError) as e:
-            print(f"Error parsing tool call: {e}")
-            print(f"Tool call structure: {tool_call if 'tool_call' in locals() else 'N/A'}")
+        except (KeyError, JSONDecodeError, AttributeError) as e:
+            logger.error("Error parsing tool call: %s", e)
+            logger.error("Tool call structure: %s", tool_call if 'tool_call' in locals() else 'N/A')
             raise ValueError(f"Failed to parse tool name from response: {e}")
 
     def _should_short_circuit_to_generate_response(self, tool_name, tool_response):
@@ -78,166 +240,248 @@ class GeneralThinkingAgent:
         Returns:
             bool: True if we should short-circuit to generate_response_tool
         """
-        if tool_name == "get_tasks_tool":
-            try:
-                parsed = json.loads(tool_response) if isinstance(tool_response, str) else tool_response
-                # get_tasks_tool always returns a valid response (even if empty)
-                # If we see a response with "tasks" key, it's valid and we should generate a response
-                if parsed and ("tasks" in parsed or "total_count" in parsed):
-                    return True
-            except Exception as e:
-                print(f"Warning: Failed to parse get_tasks_tool response for short-circuit: {e}")
-        
-        elif tool_name == "edit_tasks_tool":
-            try:
-                parsed = json.loads(tool_response) if isinstance(tool_response, str) else tool_response
-                success = (parsed or {}).get("success")
-                if success is True:
-                    return True
-            except Exception as e:
-                print(f"Warning: Failed to parse edit_tasks_tool response for short-circuit: {e}")
-        
-        elif tool_name == "delete_tasks_tool":
-            try:
-                parsed = json.loads(tool_response) if isinstance(tool_response, str) else tool_response
-                success = (parsed or {}).get("success")
-                if success is True:
-                    return True
-            except Exception as e:
-                print(f"Warning: Failed to parse delete_tasks_tool response for short-circuit: {e}")
-        
-        elif tool_name == "create_tasks_tool":
-            try:
-                parsed = json.loads(tool_response) if isinstance(tool_response, str) else tool_response
-                status = (parsed or {}).get("status")
-                success = (parsed or {}).get("success")
-                if success is True or status in {"all_tasks_created", "invalid_time"}:
-                    return True
-            except Exception as e:
-                print(f"Warning: Failed to parse create_tasks_tool response for short-circuit: {e}")
-        
-        return False
+        predicate = self._SHORT_CIRCUIT_PREDICATES.get(tool_name)
+        if predicate is None:
+            return False
+        if isinstance(tool_response, str) and not any(marker in tool_response for marker in _SHORT_CIRCUIT_KEY_MARKERS[tool_name]):
+            return False
+        
+        try:
+            parsed = loads(tool_response) if isinstance(tool_response, str) else tool_response
+        except Exception as e:
+            logger.warning("Warning: Failed to parse %s response for short-circuit: %s", tool_name, e)
+            return False
+        return isinstance(parsed, dict) and predicate(parsed)
 
 
     def think(self, user_input, scratchpad_entries, user_config=None, scratchpad_obj=None):
-        print(f"🤔 Thinking about user input: {user_input}")
-        print(f"📋 Scratchpad provided: {scratchpad_entries is not None}, length: {len(scratchpad_entries) if scratchpad_entries else 0}")
+        """Synchronous entry point; runs athink on a fresh event loop."""
+        return asyncio.run(self.athink(user_input, scratchpad_entries, user_config, scratchpad_obj))
+
+    async def athink_batch(self, inputs, max_concurrency=16):
+        """
+        Run athink for several independent inputs concurrently.
+        
+        Args:
+            inputs: Iterable of (user_input, scratchpad_entries, user_config) tuples. Scratchpad
+                entries are only read, so the same list may be shared between inputs.
+            max_concurrency: Maximum number of inputs processed at once
+        
+        Returns:
+            list: One think result per input, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _think_one(user_input, scratchpad_entries, user_config):
+            async with semaphore:
+                return await self.athink(user_input, scratchpad_entries, user_config)
+
+        return await asyncio.gather(*(
+            _think_one(user_input, scratchpad_entries, user_config)
+            for user_input, scratchpad_entries, user_config in inputs
+        ))
+
+    def think_batch(self, inputs, max_concurrency=16):
+        """Synchronous counterpart of athink_batch; runs each think() on a worker thread."""
+        inputs = list(inputs)
+        if not inputs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(inputs))) as executor:
+            return list(executor.map(lambda args: self.think(*args), inputs))
+
+    async def _select_next_tools(self, select_tool_agent, chat_history, total_tool_calls):
+        """Ask the selector for the next tool(s) and resolve them to (tool_name, tool_agent) pairs."""
+        selected_tool_response = await asyncio.to_thread(select_tool_agent.select_tool, _compact_chat_history(chat_history))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Selected tool response%s: %r", " (loop)" if total_tool_calls > 0 else "", selected_tool_response)
+        # Extract tools (handles single or multiple uniformly)
+        return self._extract_tools_from_response(
+            selected_tool_response,
+            context="loop" if total_tool_calls > 0 else "initial"
+        )
+
+    def _plan_tool_calls(self, tools, total_tool_calls, previous_tool_name, consecutive_same_tool_count):
+        """
+        Decide which of the selected tools will actually run, before dispatching any of them.
+        
+        Stops at generate_response_tool or when the total / consecutive-call limits are hit.
         
-        # Check if this exact input was already processed (to prevent infinite loops)
-        duplicate_message = check_if_already_processed(scratchpad_entries, user_input)
+        Returns:
+            tuple: (runnable (tool_name, tool_agent) pairs, whether generate_response_tool runs next,
+                    updated previous_tool_name, updated consecutive_same_tool_count)
+        """
+        runnable_tools = []
+        for tool_name, tool_agent in tools:
+            # Check if we should stop
+            if tool_name == "generate_response_tool":
+                return runnable_tools, True, previous_tool_name, consecutive_same_tool_count
+            
+            # Check total tool call limit
+            if total_tool_calls + len(runnable_tools) >= self.MAX_TOTAL_TOOL_CALLS:
+                logger.warning("⚠️ Maximum total tool calls (%d) reached. Forcing generate_response_tool.", self.MAX_TOTAL_TOOL_CALLS)
+                return runnable_tools, True, previous_tool_name, consecutive_same_tool_count
+            
+            # Check consecutive same tool limit
+            if tool_name == previous_tool_name:
+                consecutive_same_tool_count += 1
+                if consecutive_same_tool_count >= self.MAX_CONSECUTIVE_SAME_TOOL:
+                    logger.warning("⚠️ Maximum consecutive calls (%d) for tool '%s' reached. Forcing generate_response_tool.", self.MAX_CONSECUTIVE_SAME_TOOL, tool_name)
+                    return runnable_tools, True, previous_tool_name, consecutive_same_tool_count
+            else:
+                consecutive_same_tool_count = 1
+                previous_tool_name = tool_name
+            
+            runnable_tools.append((tool_name, tool_agent))
+        return runnable_tools, False, previous_tool_name, consecutive_same_tool_count
+
+    def _record_tool_responses(self, tools, tool_responses, chat_history, scratchpad_obj):
+        """Append tool responses to chat_history (and the scratchpad) in the order the tools were selected."""
+        for (tool_name, _), tool_response in zip(tools, tool_responses):
+            chat_history.append({"role": "assistant", "name": tool_name, "content": tool_response})
+            # Log only the appended turn (truncated by the format), never the whole history
+            logger.debug("Chat history +%s (%d messages): %.200s", tool_name, len(chat_history), tool_response)
+
+            # Write to scratchpad immediately so partial results are visible even if think() times out
+            if scratchpad_obj is not None:
+                scratchpad_obj.add_entry(
+                    source="agent_internal",
+                    format="function_call",
+                    name=tool_name,
+                    response={"result": tool_response}
+                )
+
+    def _batch_tools(self, tools):
+        """
+        Group consecutive parallel-safe (tool_name, tool_agent) pairs into batches; every other
+        tool gets its own batch. Batches are returned in the model-emitted order.
+        """
+        batches = []
+        previous_parallel_safe = False
+        for tool in tools:
+            parallel_safe = _is_parallel_safe(tool[1])
+            if parallel_safe and previous_parallel_safe:
+                batches[-1].append(tool)
+            else:
+                batches.append([tool])
+            previous_parallel_safe = parallel_safe
+        return batches
+
+    async def _execute_tool_batch(self, tools, chat_history, user_config):
+        """
+        Execute a batch of tools. A single tool runs against the live chat_history; a batch of
+        parallel-safe tools runs concurrently against a shared snapshot.
+        """
+        if len(tools) == 1:
+            tool_agent = tools[0][1]
+            return [await asyncio.to_thread(tool_agent.execute_tool, chat_history, user_config)]
+
+        logger.info("⚡ Executing %d tools concurrently: %s", len(tools), [tool_name for tool_name, _ in tools])
+        chat_history_snapshot = list(chat_history)
+        # TaskGroup cancels the sibling tasks as soon as one tool fails, instead of leaving them
+        # running unobserved like gather() does
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [
+                    task_group.create_task(asyncio.to_thread(tool_agent.execute_tool, chat_history_snapshot, user_config))
+                    for _, tool_agent in tools
+                ]
+        except ExceptionGroup as eg:
+            # Surface the tool's own error, as sequential execution would
+            raise eg.exceptions[0]
+        return [task.result() for task in tasks]
+
+    async def athink(self, user_input, scratchpad_entries, user_config=None, scratchpad_obj=None):
+        logger.info("🤔 Thinking about user input: %s", user_input)
+        logger.debug("📋 Scratchpad provided: %s, length: %d", scratchpad_entries is not None, len(scratchpad_entries) if scratchpad_entries else 0)
+        
+        # Check if this exact input was already processed (to prevent infinite loops) and
+        # convert scratchpad entries to chat history format if scratchpad is provided
+        duplicate_message, chat_history = scan_scratchpad(scratchpad_entries, user_input)
         if duplicate_message:
             return duplicate_message
         
-        # Convert scratchpad entries to chat history format if scratchpad is provided
-        chat_history = build_chat_history_from_scratchpad(scratchpad_entries, user_input)
+        # Only the most recent scratchpad turns are sent to the model; older ones cost prompt
+        # tokens on every select/tool call without changing the decision
+        window = (user_config or {}).get("chat_history_window") or self.CHAT_HISTORY_WINDOW
+        if len(chat_history) > window:
+            del chat_history[:-window]
         
-        # Avoid duplicating the latest user turn (scratchpad often already has this utterance)
-        _ui = normalize_text(user_input)
+        # Avoid duplicating the latest user turn (scratchpad often already has this utterance).
+        # Only normalize when there is a previous user turn to compare against.
         if not (
             chat_history
             and chat_history[-1].get("role") == "user"
-            and normalize_text(chat_history[-1].get("content", "")) == _ui
+            and normalize_text(chat_history[-1].get("content", "")) == normalize_text(user_input)
         ):
             chat_history.append({"role": "user", "content": user_input})
         
         # Debug: Print chat history to see what the agent is seeing
-        print(f"📜 Chat history for tool selection: {chat_history}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📜 Chat history for tool selection: %d messages, last: %.200r", len(chat_history), chat_history[-1])
 
-        select_tool_agent = SelectToolAgent(self.tool_agents)
+        select_tool_agent = self._get_select_tool_agent()
+        # Looked up per call (not in __init__) since tool_agents can be replaced after construction
+        generate_response_agent = self.tool_agents["generate_response_tool"]
         
-        # Tool call limits
-        MAX_TOTAL_TOOL_CALLS = 10
-        MAX_CONSECUTIVE_SAME_TOOL = 3
         total_tool_calls = 0
         previous_tool_name = None
         consecutive_same_tool_count = 0
+        # (task, chat_history length it was started for) of a speculative generate_response_tool call
+        speculative_response = None
         
-        # Main tool execution loop - unified flow for single and multiple tool calls
-        selected_tool_name = None
-        selected_tool = None
-        
-        while selected_tool_name != "generate_response_tool":
-            # Track if this is the initial iteration (before any tools have been executed)
-            is_initial_iteration = (total_tool_calls == 0)
-            
-            # Get the tool selection response
-            selected_tool_response = select_tool_agent.select_tool(chat_history)
-            context_msg = " (loop)" if total_tool_calls > 0 else ""
-            print(f"Selected tool response{context_msg}: {selected_tool_response}")
-            
-            # Extract tool names (handles single or multiple uniformly)
-            tool_names = self._extract_tool_names_from_response(
-                selected_tool_response, 
-                context="loop" if total_tool_calls > 0 else "initial"
-            )
-            
-            # Validate tool names
-            for tool_name in tool_names:
-                if tool_name not in self.tool_agents:
-                    if "select_tool" in tool_name.lower():
-                        raise ValueError(f"Invalid tool name '{tool_name}'. The model incorrectly returned the selector function name. Available tools are: {list(self.tool_agents.keys())}. Please check the select_tool_agent prompt.")
-                    raise KeyError(f"Tool '{tool_name}' not found in available tools: {list(self.tool_agents.keys())}")
-            
-            # Execute all selected tools sequentially
-            for tool_name in tool_names:
-                # Check if we should stop
-                if tool_name == "generate_response_tool":
-                    selected_tool_name = tool_name
-                    selected_tool = self.tool_agents[selected_tool_name]
+        try:
+            # Main tool execution loop - unified flow for single and multiple tool calls
+            while True:
+                # Once the total budget is spent the only possible outcome is generate_response_tool,
+                # so skip the selector round-trip. (The consecutive-call limit can't be decided here:
+                # the selector may still pick a different tool.)
+                if total_tool_calls >= self.MAX_TOTAL_TOOL_CALLS:
+                    logger.warning("⚠️ Maximum total tool calls (%d) reached. Forcing generate_response_tool.", self.MAX_TOTAL_TOOL_CALLS)
                     break
                 
-                # Check total tool call limit
-                if total_tool_calls >= MAX_TOTAL_TOOL_CALLS:
-                    print(f"⚠️ Maximum total tool calls ({MAX_TOTAL_TOOL_CALLS}) reached. Forcing generate_response_tool.")
-                    selected_tool_name = "generate_response_tool"
-                    selected_tool = self.tool_agents[selected_tool_name]
-                    break
+                tools = await self._select_next_tools(select_tool_agent, chat_history, total_tool_calls)
+                runnable_tools, generate_next, previous_tool_name, consecutive_same_tool_count = self._plan_tool_calls(
+                    tools, total_tool_calls, previous_tool_name, consecutive_same_tool_count
+                )
                 
-                # Check consecutive same tool limit
-                if tool_name == previous_tool_name:
-                    consecutive_same_tool_count += 1
-                    if consecutive_same_tool_count >= MAX_CONSECUTIVE_SAME_TOOL:
-                        print(f"⚠️ Maximum consecutive calls ({MAX_CONSECUTIVE_SAME_TOOL}) for tool '{tool_name}' reached. Forcing generate_response_tool.")
-                        selected_tool_name = "generate_response_tool"
-                        selected_tool = self.tool_agents[selected_tool_name]
-                        break
-                else:
-                    consecutive_same_tool_count = 1
-                    previous_tool_name = tool_name
+                # Execute the selected tools; independent ones overlap, results are applied in order
+                executed = []
+                for batch in self._batch_tools(runnable_tools):
+                    tool_responses = await self._execute_tool_batch(batch, chat_history, user_config)
+                    self._record_tool_responses(batch, tool_responses, chat_history, scratchpad_obj)
+                    total_tool_calls += len(batch)
+                    executed.extend(zip(batch, tool_responses))
                 
-                # Execute the tool
-                selected_tool = self.tool_agents[tool_name]
-                tool_response = selected_tool.execute_tool(chat_history, user_config)
-                print(f"Tool response: {tool_response}")
-                total_tool_calls += 1
+                if generate_next:
+                    break
                 
-                chat_history.append({"role": "assistant", "name": selected_tool.get_tool_name(), "content": tool_response})
-                print(f"Chat history: {chat_history}")
-
-                # Write to scratchpad immediately so partial results are visible even if think() times out
-                if scratchpad_obj is not None:
-                    scratchpad_obj.add_entry(
-                        source="agent_internal",
-                        format="function_call",
-                        name=selected_tool.get_tool_name(),
-                        response={"result": tool_response}
+                # When every tool that just ran looks finished, the selector will most likely pick
+                # generate_response_tool next: start it now so it overlaps the select round-trip
+                if self.speculative_generate_response and executed and all(
+                    self._should_short_circuit_to_generate_response(tool_name, tool_response)
+                    for (tool_name, _), tool_response in executed
+                ):
+                    if speculative_response is not None:
+                        _discard_task(speculative_response[0])
+                    logger.debug("Speculatively starting generate_response_tool")
+                    speculative_response = (
+                        asyncio.ensure_future(asyncio.to_thread(generate_response_agent.execute_tool, list(chat_history), user_config)),
+                        len(chat_history),
                     )
-            
-            # Break if we're generating response
-            if selected_tool_name == "generate_response_tool":
-                break
-
-        # Final tool call will be generate response
-        response = selected_tool.execute_tool(chat_history, user_config)
-        # generate_response_tool returns a string directly, other tools return ChatCompletion objects
-        if isinstance(response, str):
-            result = response
-        elif response is None:
-            raise ValueError(f"Tool '{selected_tool_name}' returned None - execution may have failed")
-        elif hasattr(response, 'choices') and response.choices:
-            result = response.choices[0].message.content
-        else:
-            raise ValueError(f"Invalid response from tool '{selected_tool_name}': {response}")
+
+            # Final tool call will be generate response. The speculative call is only used if no
+            # tool response was appended after it started, i.e. it saw the same chat history.
+            if speculative_response is not None and speculative_response[1] == len(chat_history):
+                logger.debug("Using speculative generate_response_tool result")
+                response = await speculative_response[0]
+                speculative_response = None
+            else:
+                response = await asyncio.to_thread(generate_response_agent.execute_tool, chat_history, user_config)
+        finally:
+            # A mispredicted speculative call is discarded (its worker thread finishes on its own)
+            if speculative_response is not None:
+                _discard_task(speculative_response[0])
+        result = _extract_response_text("generate_response_tool", response)
         
         # Return both the result and the chat_history (which contains tool responses)
         # This allows tools like edit_tasks_tool to find task_ids from previous tool calls
@@ -1,3 +1,4 @@
+import functools
 import os
 from openai import AzureOpenAI
 from openai import APIError
@@ -31,10 +32,13 @@ def call_openai(messages, tools=None):
     
     return response
 
+@functools.lru_cache(maxsize=1)
 def get_openai_client():
     """
     Get a configured Azure OpenAI client instance.
     
+    The client is created once and shared, so its HTTP connection pool is reused across calls.
+    
     Returns:
         AzureOpenAI: Configured client instance or None if configuration is missing
         
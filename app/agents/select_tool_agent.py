@@ -1,107 +1,160 @@
-from .gemini_client import call_gemini, gemini_response_to_openai_like
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from .gemini_client import call_gemini, gemini_response_to_openai_like, select_model
+from .utils.chat_history_utils import window_chat_history
+from .utils.json_utils import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Tool selection rules: the static part of the system prompt, shared by every SelectToolAgent
+_SELECTION_RULES = (
+    "## How to Determine if Work is Already Complete\n"
+    "- Assistant acknowledgments (e.g., 'One moment', 'Let me check', 'I'll set that up') are NOT completions.\n"
+    "- Work is only complete if you see:\n"
+    "  * A '[Completed in previous interaction via TOOL_NAME]' message, OR\n"
+    "  * An assistant message with name='create_tasks_tool' containing JSON with 'success': true and 'task_id', OR\n"
+    "  * An explicit success message from a tool execution\n\n"
+    "## CRITICAL: Only Look at the MOST RECENT User Message\n"
+    "- When determining how many tasks to create, ONLY look at the MOST RECENT user message in the chat history\n"
+    "- IGNORE tasks mentioned in previous conversations or earlier messages\n"
+    "- ONLY create tasks that are explicitly mentioned in the CURRENT user request\n"
+    "- If the most recent user message says 'remind me to eat dinner at 10pm', that's ONE task - do NOT create tasks from previous messages\n\n"
+    "## Tool Selection Rules\n"
+    "0. **CRITICAL: For READ/VIEW/CHECK/WHAT/WHEN queries**:\n"
+    "   - If the user asks 'What tasks do I have', 'Show me my tasks', 'When do I have X', 'Check my tasks', etc. → select 'get_tasks_tool' ONLY if you don't see a 'get_tasks_tool' response in the chat history yet\n"
+    "   - CRITICAL: If you see ANY assistant message with name='get_tasks_tool' in the chat history (even if it returns empty results like '{\"tasks\": [], \"total_count\": 0}'), you MUST select 'generate_response_tool' immediately\n"
+    "   - Empty task results ({\"tasks\": [], \"total_count\": 0}) are VALID results - do NOT call 'get_tasks_tool' again\n"
+    "   - NEVER select 'create_tasks_tool' for read-only queries, even if you see task data in the chat history\n"
+    "   - Read-only queries should NEVER trigger task creation\n\n"
+    "1. **For CREATE/SCHEDULE/SET/ADD requests with MULTIPLE tasks**:\n"
+    "   - Look ONLY at the MOST RECENT user message\n"
+    "   - If that message requests multiple tasks (e.g., 'remind me to X at Y and Z at W'), return MULTIPLE 'create_tasks_tool' calls - ONE for each task requested\n"
+    "   - Count how many distinct tasks the user requested in the MOST RECENT message and return that many 'create_tasks_tool' calls\n"
+    "   - Each call will extract a different task from the MOST RECENT user request\n"
+    "   - Example: If the most recent user message says 'remind me to brush teeth at 6am and pack bag at 11am', return 2 'create_tasks_tool' calls\n"
+    "   - DO NOT create tasks from previous user messages - only from the most recent one\n\n"
+    "2. **For CREATE/SCHEDULE/SET/ADD requests with a SINGLE task**:\n"
+    "   - Look ONLY at the MOST RECENT user message\n"
+    "   - If that message requests a single task and no task was created yet for THIS request → select 'create_tasks_tool'\n"
+    "   - CRITICAL: If you see ANY assistant message with name='create_tasks_tool' containing JSON with 'success': true AFTER the most recent user message → select 'generate_response_tool' immediately (the task has already been created)\n"
+    "   - If a task was already created for THIS request → select 'generate_response_tool' (do NOT select 'create_tasks_tool' again)\n"
+    "   - If you see an assistant message with name='create_tasks_tool' whose JSON includes 'success': false → select 'generate_response_tool' (the tool already determined the request cannot be completed as requested; ask the user for a new time)\n"
+    "   - If you see an assistant message with name='create_tasks_tool' whose JSON includes 'status': 'all_tasks_created' → select 'generate_response_tool' (all tasks from the most recent user message have been created)\n"
+    "   - Do NOT use 'generate_response_tool' for new task creation requests\n\n"
+    "3. **After tasks have been created**:\n"
+    "   - Find the MOST RECENT user message in the chat history\n"
+    "   - Count how many distinct tasks the user requested in that MOST RECENT user message ONLY\n"
+    "   - Count how many 'create_tasks_tool' responses with 'success': true appear AFTER that most recent user message\n"
+    "   - If the counts match (all tasks from the most recent message created) → select 'generate_response_tool'\n"
+    "   - If the counts don't match (some tasks from the most recent message still need to be created) → select 'create_tasks_tool' again\n"
+    "   - IMPORTANT: Only select 'generate_response_tool' when you are CERTAIN all tasks from the MOST RECENT user message have been created\n"
+    "   - If you see 'status': 'all_tasks_created' in a create_tasks_tool response → select 'generate_response_tool' immediately\n\n"
+    "4. **For EDIT/UPDATE/COMPLETE/DEFER requests**:\n"
+    "   - CRITICAL: If the user says they have completed a task (e.g., 'I completed X', 'I finished Y', 'I did Z', 'I'm done with X') → select 'edit_tasks_tool' to mark the task as completed\n"
+    "   - CRITICAL: If the user wants to defer the task (e.g., 'I'll do it later', 'not yet', 'I need more time', 'I haven't finished X', 'I'm not done with Y', 'I'm not done yet', 'remind me later', 'not finished') → select 'edit_tasks_tool' to defer the task by 5 minutes (update time_to_execute)\n"
+    "   - If the user asks to 'mark as complete', 'complete', 'mark as done', 'mark as pending', 'uncomplete', 'reopen', etc. → select 'edit_tasks_tool'\n"
+    "   - CRITICAL: 'edit_tasks_tool' should ONLY be called when the agent has a SPECIFIC task_id from chat history / previous tool calls\n"
+    "   - The agent must have a task_id from previous 'get_tasks_tool' or 'create_tasks_tool' calls in the chat history\n"
+    "   - If no task_id is available in chat history, first use 'get_tasks_tool' to retrieve tasks (which will provide task_ids), then use 'edit_tasks_tool'\n"
+    "   - Do NOT call 'edit_tasks_tool' if you cannot find a specific task_id in the chat history\n"
+    "   - After 'edit_tasks_tool' completes successfully → select 'generate_response_tool'\n"
+    "   - If 'edit_tasks_tool' returns 'success': false → select 'generate_response_tool' to inform the user of the error\n\n"
+    "5. **For SEND MESSAGE TO CARETAKER requests**:\n"
+    "   - If the user asks to send a message to their caretaker OR implies a reply to their caretaker (e.g., 'send a message to my caretaker', 'text my caretaker that...', 'tell my caretaker...', 'tell her...', 'let him know...', 'reply to her...', 'text her back...') → select 'send_message_tool'\n"
+    "   - After 'send_message_tool' completes → select 'generate_response_tool'\n\n"
+    "6. **For DELETE/REMOVE/CANCEL requests**:\n"
+    "   - CRITICAL: If the user explicitly asks to DELETE, REMOVE, or CANCEL a task (e.g., 'delete X', 'remove Y', 'cancel Z', 'delete that task', 'remove my reminder for X') → select 'delete_tasks_tool'\n"
+    "   - CRITICAL: 'delete_tasks_tool' should ONLY be called when the agent has a SPECIFIC task_id from chat history / previous tool calls\n"
+    "   - The agent must have a task_id from previous 'get_tasks_tool' or 'create_tasks_tool' calls in the chat history\n"
+    "   - If no task_id is available in chat history, first use 'get_tasks_tool' to retrieve tasks (which will provide task_ids), then use 'delete_tasks_tool'\n"
+    "   - Do NOT call 'delete_tasks_tool' if you cannot find a specific task_id in the chat history\n"
+    "   - After 'delete_tasks_tool' completes successfully → select 'generate_response_tool'\n"
+    "   - If 'delete_tasks_tool' returns 'success': false → select 'generate_response_tool' to inform the user of the error\n\n"
+    "7. **For other requests**:\n"
+    "   - Select the appropriate tool for the user's request\n"
+    "   - Do NOT duplicate work already completed in the chat history\n"
+    "   - If the request is already satisfied → select 'generate_response_tool'\n\n"
+    "8. **General principles**:\n"
+    "   - New user requests (even if similar to previous ones) should be handled with the appropriate tool\n"
+    "   - Prefer tools that move the conversation forward\n"
+    "   - Only use 'generate_response_tool' when ALL requested tasks are created AND the request is satisfied\n\n"
+)
+
+# Read-only questions about tasks ("What tasks do I have today?", "When is my reminder?")
+_READ_RE = re.compile(r"^\s*(?:what|when|which|show|list|check|do i have|are there|have i got)\b.*\b(?:tasks?|reminders?|schedule|to-?dos?)\b", re.IGNORECASE)
+# Anything that asks for a change, so the message is not read-only after all
+_WRITE_RE = re.compile(
+    r"\b(?:create|schedule|set|add|remind|edit|update|change|move|complete|completed|finish|finished|done|defer|"
+    r"delete|remove|cancel|mark|send|text|tell)\b",
+    re.IGNORECASE,
+)
+# Tools whose result, once returned for the current request, always leads to generate_response_tool
+_FINAL_RESULT_TOOLS = frozenset(("edit_tasks_tool", "delete_tasks_tool", "send_message_tool"))
+_CREATE_TASKS_FINAL_STATUSES = frozenset(("all_tasks_created", "invalid_time"))
+
+
+def _selection_response(tool_name):
+    """Build a selector response (same shape as gemini_response_to_openai_like) for tool_name."""
+    tool_call = SimpleNamespace(
+        id="call_0",
+        function=SimpleNamespace(name="select_tool", arguments=dumps({"tool_name": tool_name})),
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="", tool_calls=[tool_call]))])
+
+
+def _parse_tool_response(content):
+    """Parse a tool message's JSON content; None when it isn't a JSON object."""
+    if isinstance(content, dict):
+        return content
+    try:
+        parsed = loads(content)
+    except Exception:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
 
 class SelectToolAgent:
     tool_agents = {}
 
+    # Maximum number of memoized selections kept per SelectToolAgent
+    SELECTION_CACHE_SIZE = 1024
+
     def __init__(self, tool_agents):
         self.tool_agents = tool_agents
+        # chat-history digest -> selector response, least recently used first. The cache belongs to
+        # this instance, so it is dropped together with the agent when tool_agents changes.
+        self._selection_cache = OrderedDict()
+        self._selection_cache_lock = threading.Lock()
 
-    def select_tool(self, chat_history):
-        # Create a system message with tool descriptions
+        # Tool descriptions, names and the selector schema only depend on tool_agents, so they are
+        # built once here rather than on every select_tool() call
+        tool_name_enum = []
         tool_descriptions = "Available tools:\n"
         for tool_agent in self.tool_agents.values():
-            print(f"Tool agent: {tool_agent}")
-            tool_descriptions += f"{tool_agent.get_tool_name()}: {tool_agent.get_tool_description()}\n"
-
-        # Create messages array for OpenAI API
-        tool_name_enum = [tool_agent.get_tool_name() for tool_agent in self.tool_agents.values()]
+            tool_name = tool_agent.get_tool_name()
+            tool_name_enum.append(tool_name)
+            tool_descriptions += f"{tool_name}: {tool_agent.get_tool_description()}\n"
         tool_names_list = ", ".join(tool_name_enum)
-        
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "You are a tool selector. "
-                    f"Given the chat history {chat_history}, select the most appropriate tool(s) "
-                    "to call from the list below.\n\n"
-                    "## How to Determine if Work is Already Complete\n"
-                    "- Assistant acknowledgments (e.g., 'One moment', 'Let me check', 'I'll set that up') are NOT completions.\n"
-                    "- Work is only complete if you see:\n"
-                    "  * A '[Completed in previous interaction via TOOL_NAME]' message, OR\n"
-                    "  * An assistant message with name='create_tasks_tool' containing JSON with 'success': true and 'task_id', OR\n"
-                    "  * An explicit success message from a tool execution\n\n"
-                    "## CRITICAL: Only Look at the MOST RECENT User Message\n"
-                    "- When determining how many tasks to create, ONLY look at the MOST RECENT user message in the chat history\n"
-                    "- IGNORE tasks mentioned in previous conversations or earlier messages\n"
-                    "- ONLY create tasks that are explicitly mentioned in the CURRENT user request\n"
-                    "- If the most recent user message says 'remind me to eat dinner at 10pm', that's ONE task - do NOT create tasks from previous messages\n\n"
-                    "## Tool Selection Rules\n"
-                    "0. **CRITICAL: For READ/VIEW/CHECK/WHAT/WHEN queries**:\n"
-                    "   - If the user asks 'What tasks do I have', 'Show me my tasks', 'When do I have X', 'Check my tasks', etc. → select 'get_tasks_tool' ONLY if you don't see a 'get_tasks_tool' response in the chat history yet\n"
-                    "   - CRITICAL: If you see ANY assistant message with name='get_tasks_tool' in the chat history (even if it returns empty results like '{\"tasks\": [], \"total_count\": 0}'), you MUST select 'generate_response_tool' immediately\n"
-                    "   - Empty task results ({\"tasks\": [], \"total_count\": 0}) are VALID results - do NOT call 'get_tasks_tool' again\n"
-                    "   - NEVER select 'create_tasks_tool' for read-only queries, even if you see task data in the chat history\n"
-                    "   - Read-only queries should NEVER trigger task creation\n\n"
-                    "1. **For CREATE/SCHEDULE/SET/ADD requests with MULTIPLE tasks**:\n"
-                    "   - Look ONLY at the MOST RECENT user message\n"
-                    "   - If that message requests multiple tasks (e.g., 'remind me to X at Y and Z at W'), return MULTIPLE 'create_tasks_tool' calls - ONE for each task requested\n"
-                    "   - Count how many distinct tasks the user requested in the MOST RECENT message and return that many 'create_tasks_tool' calls\n"
-                    "   - Each call will extract a different task from the MOST RECENT user request\n"
-                    "   - Example: If the most recent user message says 'remind me to brush teeth at 6am and pack bag at 11am', return 2 'create_tasks_tool' calls\n"
-                    "   - DO NOT create tasks from previous user messages - only from the most recent one\n\n"
-                    "2. **For CREATE/SCHEDULE/SET/ADD requests with a SINGLE task**:\n"
-                    "   - Look ONLY at the MOST RECENT user message\n"
-                    "   - If that message requests a single task and no task was created yet for THIS request → select 'create_tasks_tool'\n"
-                    "   - CRITICAL: If you see ANY assistant message with name='create_tasks_tool' containing JSON with 'success': true AFTER the most recent user message → select 'generate_response_tool' immediately (the task has already been created)\n"
-                    "   - If a task was already created for THIS request → select 'generate_response_tool' (do NOT select 'create_tasks_tool' again)\n"
-                    "   - If you see an assistant message with name='create_tasks_tool' whose JSON includes 'success': false → select 'generate_response_tool' (the tool already determined the request cannot be completed as requested; ask the user for a new time)\n"
-                    "   - If you see an assistant message with name='create_tasks_tool' whose JSON includes 'status': 'all_tasks_created' → select 'generate_response_tool' (all tasks from the most recent user message have been created)\n"
-                    "   - Do NOT use 'generate_response_tool' for new task creation requests\n\n"
-                    "3. **After tasks have been created**:\n"
-                    "   - Find the MOST RECENT user message in the chat history\n"
-                    "   - Count how many distinct tasks the user requested in that MOST RECENT user message ONLY\n"
-                    "   - Count how many 'create_tasks_tool' responses with 'success': true appear AFTER that most recent user message\n"
-                    "   - If the counts match (all tasks from the most recent message created) → select 'generate_response_tool'\n"
-                    "   - If the counts don't match (some tasks from the most recent message still need to be created) → select 'create_tasks_tool' again\n"
-                    "   - IMPORTANT: Only select 'generate_response_tool' when you are CERTAIN all tasks from the MOST RECENT user message have been created\n"
-                    "   - If you see 'status': 'all_tasks_created' in a create_tasks_tool response → select 'generate_response_tool' immediately\n\n"
-                    "4. **For EDIT/UPDATE/COMPLETE/DEFER requests**:\n"
-                    "   - CRITICAL: If the user says they have completed a task (e.g., 'I completed X', 'I finished Y', 'I did Z', 'I'm done with X') → select 'edit_tasks_tool' to mark the task as completed\n"
-                    "   - CRITICAL: If the user wants to defer the task (e.g., 'I'll do it later', 'not yet', 'I need more time', 'I haven't finished X', 'I'm not done with Y', 'I'm not done yet', 'remind me later', 'not finished') → select 'edit_tasks_tool' to defer the task by 5 minutes (update time_to_execute)\n"
-                    "   - If the user asks to 'mark as complete', 'complete', 'mark as done', 'mark as pending', 'uncomplete', 'reopen', etc. → select 'edit_tasks_tool'\n"
-                    "   - CRITICAL: 'edit_tasks_tool' should ONLY be called when the agent has a SPECIFIC task_id from chat history / previous tool calls\n"
-                    "   - The agent must have a task_id from previous 'get_tasks_tool' or 'create_tasks_tool' calls in the chat history\n"
-                    "   - If no task_id is available in chat history, first use 'get_tasks_tool' to retrieve tasks (which will provide task_ids), then use 'edit_tasks_tool'\n"
-                    "   - Do NOT call 'edit_tasks_tool' if you cannot find a specific task_id in the chat history\n"
-                    "   - After 'edit_tasks_tool' completes successfully → select 'generate_response_tool'\n"
-                    "   - If 'edit_tasks_tool' returns 'success': false → select 'generate_response_tool' to inform the user of the error\n\n"
-                    "5. **For SEND MESSAGE TO CARETAKER requests**:\n"
-                    "   - If the user asks to send a message to their caretaker OR implies a reply to their caretaker (e.g., 'send a message to my caretaker', 'text my caretaker that...', 'tell my caretaker...', 'tell her...', 'let him know...', 'reply to her...', 'text her back...') → select 'send_message_tool'\n"
-                    "   - After 'send_message_tool' completes → select 'generate_response_tool'\n\n"
-                    "6. **For DELETE/REMOVE/CANCEL requests**:\n"
-                    "   - CRITICAL: If the user explicitly asks to DELETE, REMOVE, or CANCEL a task (e.g., 'delete X', 'remove Y', 'cancel Z', 'delete that task', 'remove my reminder for X') → select 'delete_tasks_tool'\n"
-                    "   - CRITICAL: 'delete_tasks_tool' should ONLY be called when the agent has a SPECIFIC task_id from chat history / previous tool calls\n"
-                    "   - The agent must have a task_id from previous 'get_tasks_tool' or 'create_tasks_tool' calls in the chat history\n"
-                    "   - If no task_id is available in chat history, first use 'get_tasks_tool' to retrieve tasks (which will provide task_ids), then use 'delete_tasks_tool'\n"
-                    "   - Do NOT call 'delete_tasks_tool' if you cannot find a specific task_id in the chat history\n"
-                    "   - After 'delete_tasks_tool' completes successfully → select 'generate_response_tool'\n"
-                    "   - If 'delete_tasks_tool' returns 'success': false → select 'generate_response_tool' to inform the user of the error\n\n"
-                    "7. **For other requests**:\n"
-                    "   - Select the appropriate tool for the user's request\n"
-                    "   - Do NOT duplicate work already completed in the chat history\n"
-                    "   - If the request is already satisfied → select 'generate_response_tool'\n\n"
-                    "8. **General principles**:\n"
-                    "   - New user requests (even if similar to previous ones) should be handled with the appropriate tool\n"
-                    "   - Prefer tools that move the conversation forward\n"
-                    "   - Only use 'generate_response_tool' when ALL requested tasks are created AND the request is satisfied\n\n"
-                    f"## Available Tools\n"
-                    f"You MUST return one or more of these tool names exactly: {tool_names_list}\n"
-                    f"{tool_descriptions}"
-                ),
-            },
-        ]
+        logger.debug("Tool selector built for tools: %s", tool_names_list)
+
+        # The system prompt is fully static so the model API's prefix cache can reuse it; the
+        # chat history is sent separately as the trailing user message
+        self._system_prompt = (
+            "You are a tool selector. "
+            "Given the chat history in the user message, select the most appropriate tool(s) "
+            "to call from the list below.\n\n"
+            + _SELECTION_RULES
+            + f"## Available Tools\n"
+            f"You MUST return one or more of these tool names exactly: {tool_names_list}\n"
+            f"{tool_descriptions}"
+        )
 
-        selecting_tool = {
+        self._selecting_tool = {
             "type": "function",
             "function": {
                 "name": "select_tool",
@@ -119,5 +172,103 @@ class SelectToolAgent:
                 },
             }
         }
-        response = call_gemini(messages, [selecting_tool])
+
+    @staticmethod
+    def _chat_history_key(chat_history):
+        """Stable digest of the chat history used as the selection cache key."""
+        serialized = dumps(chat_history, sort_keys=True, default=str)
+        return hashlib.blake2b(serialized.encode("utf-8"), digest_size=16).digest()
+
+    def select_tool(self, chat_history):
+        """
+        Select the next tool(s) for the chat history.
+        
+        Cases the selection rules decide mechanically are answered by _fast_select, and identical
+        chat histories (e.g. a retried turn) reuse the previous selection, instead of paying for
+        another model round-trip.
+        """
+        tool_name = self._fast_select(chat_history)
+        if tool_name is not None:
+            logger.debug("Selected %s by rule, skipping the model call", tool_name)
+            return _selection_response(tool_name)
+
+        chat_history = window_chat_history(chat_history)
+        key = self._chat_history_key(chat_history)
+        with self._selection_cache_lock:
+            cached = self._selection_cache.get(key)
+            if cached is not None:
+                self._selection_cache.move_to_end(key)
+                return cached
+
+        response = self._select_tool_uncached(chat_history)
+        if not self._has_valid_selection(response):
+            # Not cached, so a retry of the same turn asks the model again
+            return response
+
+        with self._selection_cache_lock:
+            self._selection_cache[key] = response
+            self._selection_cache.move_to_end(key)
+            if len(self._selection_cache) > self.SELECTION_CACHE_SIZE:
+                self._selection_cache.popitem(last=False)
+        return response
+
+    def _has_valid_selection(self, response):
+        """Whether the selector response names at least one tool in tool_agents."""
+        choices = getattr(response, "choices", None)
+        message = choices[0].message if choices else None
+        for tool_call in getattr(message, "tool_calls", None) or ():
+            arguments = _parse_tool_response(getattr(getattr(tool_call, "function", None), "arguments", None))
+            if arguments is not None and arguments.get("tool_name") in self.tool_agents:
+                return True
+        return False
+
+    def _fast_select(self, chat_history):
+        """
+        Apply the deterministic selection rules without calling the model.
+
+        Looks only at the most recent user message and the tool messages after it:
+        - edit/delete/send_message results, and create_tasks results that failed or report
+          'all_tasks_created' / 'invalid_time', are followed by generate_response_tool
+        - a read-only task question is answered with get_tasks_tool, then generate_response_tool
+
+        Returns:
+            str: The tool name to select, or None when the model has to decide
+        """
+        last_tool_message = None
+        user_message = None
+        for idx in range(len(chat_history) - 1, -1, -1):
+            msg = chat_history[idx]
+            if msg.get("role") == "user":
+                user_message = msg.get("content") or ""
+                break
+            if last_tool_message is None and msg.get("name"):
+                last_tool_message = msg
+        if user_message is None:
+            return None
+
+        tool_name = None
+        if last_tool_message is None:
+            if _READ_RE.search(user_message) and not _WRITE_RE.search(user_message):
+                tool_name = "get_tasks_tool"
+        else:
+            name = last_tool_message["name"]
+            if name in _FINAL_RESULT_TOOLS:
+                tool_name = "generate_response_tool"
+            elif name == "create_tasks_tool":
+                parsed = _parse_tool_response(last_tool_message.get("content"))
+                if parsed is not None and (parsed.get("success") is False or parsed.get("status") in _CREATE_TASKS_FINAL_STATUSES):
+                    tool_name = "generate_response_tool"
+            elif name == "get_tasks_tool":
+                if _READ_RE.search(user_message) and not _WRITE_RE.search(user_message):
+                    tool_name = "generate_response_tool"
+
+        # Only answer with tools this selector actually offers
+        return tool_name if tool_name in self.tool_agents else None
+
+    def _select_tool_uncached(self, chat_history):
+        messages = [
+            {"role": "system", "content": self._system_prompt},
+            {"role": "user", "content": f"Chat history:\n{dumps(chat_history, default=str)}"},
+        ]
+        response = call_gemini(messages, [self._selecting_tool], model=select_model, cache_static_prefix=True)
         return gemini_response_to_openai_like(response)
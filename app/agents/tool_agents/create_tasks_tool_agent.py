@@ -1,18 +1,106 @@
-import json
+import logging
 import uuid
 from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
-from database import execute_update, update_task_enqueue_sequence_id
+from types import MappingProxyType
+from database import execute_values_update, update_task_enqueue_sequence_id
 from psycopg2.extras import Json
 
 from ..gemini_client import call_gemini, gemini_response_to_openai_like
-from ..utils.text_utils import normalize_text
-from enqueue.task_enqueue import enqueue_task
+from ..utils.chat_history_utils import summarize_chat_history
+from ..utils.datetime_utils import get_zoneinfo, parse_iso_datetime
+from ..utils.json_utils import dumps, loads
+from ..utils.task_parsing_utils import try_parse_task
+from enqueue.task_enqueue import enqueue_tasks
+from enqueue.task_work_queue import submit_task_work
+
+logger = logging.getLogger(__name__)
+
+# Stands in for a missing user_config so defaults come from one .get per field
+_EMPTY_USER_CONFIG = MappingProxyType({})
+
+# Task extraction and time interpretation rules: the static tail of the create system prompt
+_TASK_EXTRACTION_RULES = (
+    "\n\nTASK EXTRACTION RULES:"
+    "\n- Extract tasks ONLY from the MOST RECENT user message (see above)."
+    "\n- Do NOT extract tasks from previous messages or make up tasks that don't exist in the most recent user message."
+    "\n- If the user requested multiple tasks in one message, extract ONE task per call."
+    "\n- Extract tasks in the ORDER they appear in the MOST RECENT user message, but SKIP any that have already been created."
+    "\n- Extract the task description and time exactly as the user specified for THAT specific task."
+    "\n- If all requested tasks from the most recent user message have been created, return an error with 'status': 'all_tasks_created'."
+    "\n\nTIME INTERPRETATION RULES (CRITICAL):"
+    "\n- ALWAYS resolve relative phrases using the user context above."
+    "\n- If the user provides a time with NO relative phrase and NO explicit date, schedule it for the CURRENT DATE in the user's timezone."
+    "\n- For 'today', 'tonight', 'this evening', 'this afternoon', 'this morning', 'this noon': ALWAYS use the CURRENT calendar date in the user's timezone, regardless of what time it is now."
+    "\n  * Example: If current date is November 29, 2025 and user says 'tonight at 9:30', use November 29, 2025 at 9:30 PM - NOT November 30."
+    "\n  * 'Tonight' means the night of the CURRENT date, not tomorrow night."
+    "\n- For 'tomorrow': use the next calendar date in the user's timezone."
+    "\n  * Example: If current date is January 24, 2026 and user says 'tomorrow night at 9:30', use January 25, 2026 at 9:30 PM."
+    "\n  * Example: If current date is January 24, 2026 and user says 'tomorrow morning at 9:30', use January 25, 2026 at 9:30 AM"
+    "\n- NEVER roll an ambiguous time (like 'at 11pm') to the next day. Keep it on the current date and let the server validate it."
+    "\n- Return the datetime in full ISO 8601 with timezone offset (e.g., 2026-01-20T23:00:00-08:00 for 11pm on January 20)."
+)
+
+
+def _enqueue_created_tasks(tasks):
+    """Enqueue inserted tasks to Service Bus and persist their sequence ids (runs via submit_task_work)."""
+    # Enqueue all tasks to Service Bus over one client / sender
+    enqueue_results = enqueue_tasks([
+        {
+            "task_id": task["task_id"],
+            "user_id": task["user_id"],
+            "task_info": task["task_info"],
+            "time_to_execute": task["time_to_execute"].isoformat(),
+        }
+        for task in tasks
+    ])
+    logger.debug("Tasks enqueued to Service Bus: %s", enqueue_results)
+
+    for task, enqueue_result in zip(tasks, enqueue_results):
+        if not enqueue_result.get("success"):
+            logger.warning("Warning: Failed to enqueue task %s to Service Bus: %s", task["task_id"], enqueue_result.get("error"))
+            continue
+        # Persist Service Bus sequence_id to task row when present (scheduled messages only)
+        if enqueue_result.get("sequence_id") is not None:
+            try:
+                update_task_enqueue_sequence_id(task["task_id"], enqueue_result["sequence_id"])
+            except Exception as update_err:
+                logger.warning("Warning: Failed to update enqueue_sequence_id for task %s: %s", task["task_id"], update_err)
+    return enqueue_results
+
+
+def _log_enqueue_failure(future):
+    # Enqueue failures are non-fatal - the tasks are already in the database
+    error = future.exception()
+    if error is not None:
+        logger.warning("Warning: Failed to enqueue tasks to Service Bus: %s", error)
+
 
 class CreateTasksToolAgent:
     name = "create_tasks_tool"
     description = "Create a new task with a description and time to execute. Use this tool ONLY when the user explicitly asks to CREATE, SCHEDULE, SET, or ADD a task. NEVER use this tool for read-only queries like 'What tasks do I have' or 'Show me my tasks'. Use this tool at most once for each user instruction unless the user explicitly asks for multiple tasks."
 
+    selecting_tool = {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "task_info": {
+                        "type": "string",
+                        "description": "The information / description of the task to create.",
+                    },
+                    "time_to_execute": {
+                        "type": "string",
+                        "description": "The time when the task should be executed. This MUST be in ISO format with timezone (e.g., '2026-01-17T16:00:00-08:00' for 4pm PST).",
+                    },
+                },
+                "required": ["task_info", "time_to_execute"],
+            },
+        }
+    }
+
     def get_tool_description(self):
         return self.description
 
@@ -22,122 +110,67 @@ class CreateTasksToolAgent:
     def execute_tool(self, chat_history, user_config=None):
         # Build system message with user config context for time parsing
         # Pull user context (as provided by main.py)
-        user_name = user_config.get("user_name") if user_config else "the user"
-        current_time_str = user_config.get("current_time_str") if user_config else "unknown time"
-        current_date_str = user_config.get("current_date_str") if user_config else "unknown date"
-        timezone = user_config.get("timezone") if user_config else "UTC"
+        config = user_config or _EMPTY_USER_CONFIG
+        user_name = config.get("user_name", "the user")
+        current_time_str = config.get("current_time_str", "unknown time")
+        current_date_str = config.get("current_date_str", "unknown date")
+        user_timezone = config.get("timezone", "UTC")
 
-        # Find the most recent user message
+        # One reverse pass finds the most recent user message and the create_tasks_tool results
+        # after it, i.e. the tasks already created for *this* user turn
         most_recent_user_message = None
-        for msg in reversed(chat_history):
-            if msg.get("role") == "user":
-                most_recent_user_message = msg.get("content", "")
+        created_task_contents = []
+        for idx in range(len(chat_history) - 1, -1, -1):
+            msg = chat_history[idx]
+            get = msg.get
+            if get("role") == "user":
+                most_recent_user_message = get("content", "")
                 break
-        
-        # Tasks already created for *this* user turn only: scan after the LAST matching user message
-        # (duplicate user lines in history used to anchor at the first match and mis-count).
-        created_tasks = []
-        if most_recent_user_message:
-            mr_norm = normalize_text(most_recent_user_message)
-            start_after = -1
-            for idx, msg in enumerate(chat_history):
-                if msg.get("role") == "user" and normalize_text(msg.get("content", "")) == mr_norm:
-                    start_after = idx
-            if start_after >= 0:
-                for msg in chat_history[start_after + 1 :]:
-                    if msg.get("name") == "create_tasks_tool" and msg.get("content"):
-                        try:
-                            content = json.loads(msg["content"]) if isinstance(msg["content"], str) else msg["content"]
-                            if content.get("success") and content.get("task_info"):
-                                task_info = content.get("task_info", {})
-                                task_desc = task_info.get("info", "") if isinstance(task_info, dict) else str(task_info)
-                                created_tasks.append(task_desc.lower().strip())
-                        except Exception:
-                            pass
-        
-        system_content = (
-            f"Given the chat history {chat_history}, the assistant has decided to use the {self.name}."
-            f"\n\nUSER CONTEXT:\n- User name: {user_name}\n- Current time: {current_time_str}\n- Current date: {current_date_str}\n- User timezone: {timezone}"
-        )
-        
+            if get("name") == "create_tasks_tool" and get("content"):
+                created_task_contents.append(msg["content"])
+
+        created_tasks = set()
         if most_recent_user_message:
-            system_content += (
-                f"\n\n⚠️ CRITICAL: The MOST RECENT user message is: \"{most_recent_user_message}\""
-                f"\n- You MUST ONLY extract tasks from this message. Do NOT extract tasks from previous messages or make up tasks."
-                f"\n- If the user said 'brush my teeth at 6am and eat breakfast at 11am', extract ONLY 'brush my teeth' or 'eat breakfast' - nothing else."
-                f"\n\n⚠️ TIME INTERPRETATION FOR THIS REQUEST:"
-                f"\n- Current date is: {current_date_str}"
-                f"\n- If the user says 'tonight', 'today', 'this evening', etc., or if no relative phrase is provided, they mean {current_date_str} - NOT tomorrow."
-                f"\n- ONLY use tomorrow's date if the user explicitly says 'tomorrow'."
-            )
+            for content in reversed(created_task_contents):
+                if isinstance(content, str):
+                    # Only successful creates count, so skip failures and non-JSON text without
+                    # decoding them. Both the compact and the stdlib json.dumps spacing are matched.
+                    if '"success":true' not in content and '"success": true' not in content:
+                        continue
+                    try:
+                        content = loads(content)
+                    except ValueError:
+                        continue
+                if not isinstance(content, dict):
+                    continue
+                task_info = content.get("task_info")
+                if content.get("success") and task_info:
+                    task_desc = task_info.get("info", "") if isinstance(task_info, dict) else str(task_info)
+                    if isinstance(task_desc, str):
+                        created_tasks.add(task_desc.lower().strip())
         
-        if created_tasks:
-            system_content += (
-                f"\n\n⚠️ CRITICAL: The following tasks have ALREADY been created from the most recent user message: {created_tasks}"
-                f"\n- You MUST extract a DIFFERENT task from the MOST RECENT user message that has NOT been created yet."
-                f"\n- If all tasks from the most recent user message have been created, return an error."
+        fast_parsed = None
+        if most_recent_user_message and not created_tasks:
+            # Simple "remind me to X at 6pm" requests are parsed directly, skipping the model call
+            try:
+                fast_parsed = try_parse_task(most_recent_user_message, datetime.now(get_zoneinfo(user_timezone)))
+            except Exception as e:
+                logger.warning("Warning: Fast task parse failed, falling back to the model: %s", e)
+        if fast_parsed:
+            task_info, parsed_time = fast_parsed
+            time_to_execute_str = parsed_time.isoformat()
+        else:
+            task_info, time_to_execute_str = self._extract_task_with_model(
+                chat_history, most_recent_user_message, created_tasks, user_name, current_time_str, current_date_str, user_timezone
             )
-        
-        system_content += (
-            "\n\nTASK EXTRACTION RULES:"
-            "\n- Extract tasks ONLY from the MOST RECENT user message (see above)."
-            "\n- Do NOT extract tasks from previous messages or make up tasks that don't exist in the most recent user message."
-            "\n- If the user requested multiple tasks in one message, extract ONE task per call."
-            "\n- Extract tasks in the ORDER they appear in the MOST RECENT user message, but SKIP any that have already been created."
-            "\n- Extract the task description and time exactly as the user specified for THAT specific task."
-            "\n- If all requested tasks from the most recent user message have been created, return an error with 'status': 'all_tasks_created'."
-            "\n\nTIME INTERPRETATION RULES (CRITICAL):"
-            "\n- ALWAYS resolve relative phrases using the user context above."
-            "\n- If the user provides a time with NO relative phrase and NO explicit date, schedule it for the CURRENT DATE in the user's timezone."
-            "\n- For 'today', 'tonight', 'this evening', 'this afternoon', 'this morning', 'this noon': ALWAYS use the CURRENT calendar date in the user's timezone, regardless of what time it is now."
-            "\n  * Example: If current date is November 29, 2025 and user says 'tonight at 9:30', use November 29, 2025 at 9:30 PM - NOT November 30."
-            "\n  * 'Tonight' means the night of the CURRENT date, not tomorrow night."
-            "\n- For 'tomorrow': use the next calendar date in the user's timezone."
-            "\n  * Example: If current date is January 24, 2026 and user says 'tomorrow night at 9:30', use January 25, 2026 at 9:30 PM."
-            "\n  * Example: If current date is January 24, 2026 and user says 'tomorrow morning at 9:30', use January 25, 2026 at 9:30 AM"
-            "\n- NEVER roll an ambiguous time (like 'at 11pm') to the next day. Keep it on the current date and let the server validate it."
-            "\n- Return the datetime in full ISO 8601 with timezone offset (e.g., 2026-01-20T23:00:00-08:00 for 11pm on January 20)."
-        )
-
-        print(f"System content: {system_content}")
-        
-        messages = [
-            {"role": "system", "content": system_content},
-        ]
-
-        selecting_tool = {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_info": {
-                            "type": "string",
-                            "description": "The information / description of the task to create.",
-                        },
-                        "time_to_execute": {
-                            "type": "string",
-                            "description": f"The time when the task should be executed. This MUST be in ISO format with timezone (e.g., '2026-01-17T16:00:00-08:00' for 4pm PST).",
-                        },
-                    },
-                    "required": ["task_info", "time_to_execute"],
-                },
-            }
-        }
-        response = gemini_response_to_openai_like(call_gemini(messages, [selecting_tool]))
-        arguments = json.loads(response.choices[0].message.tool_calls[0].function.arguments)
-        task_info = arguments["task_info"]
-        time_to_execute_str = arguments["time_to_execute"]
-        print(f"Task description: {task_info}")
-        print(f"Time to execute: {time_to_execute_str}")
+        logger.debug("Task description: %s", task_info)
+        logger.debug("Time to execute: %s", time_to_execute_str)
 
         # Validate: Check if this task has already been created
         task_info_lower = task_info.lower().strip()
         if task_info_lower in created_tasks:
-            print(f"⚠️ Task '{task_info}' has already been created. All tasks from the most recent user message have been created.")
-            return json.dumps({
+            logger.info("⚠️ Task '%s' has already been created. All tasks from the most recent user message have been created.", task_info)
+            return dumps({
                 "success": False,
                 "message": f"All tasks from the most recent user message have already been created. The task '{task_info}' was already created.",
                 "task_id": None,
@@ -147,15 +180,13 @@ class CreateTasksToolAgent:
             })
 
         # Parse the string date into datetime object
-        time_to_execute = datetime.fromisoformat(time_to_execute_str.replace('Z', '+00:00'))
+        time_to_execute = parse_iso_datetime(time_to_execute_str)
         
         # Ensure the datetime is in the user's timezone (not UTC)
         # The database should store times in the user's timezone, not UTC
-        user_timezone = "UTC"
-        if user_config:
-            user_timezone = user_config.get("timezone", "UTC")
+        tz_error = None
         try:
-            user_tz = ZoneInfo(user_timezone)
+            user_tz = get_zoneinfo(user_timezone)
             # If the datetime is timezone-naive, assume it's in user's timezone and attach it
             if time_to_execute.tzinfo is None:
                 time_to_execute = time_to_execute.replace(tzinfo=user_tz)
@@ -166,21 +197,23 @@ class CreateTasksToolAgent:
             # If it already has a non-UTC timezone (like PST with -08:00), keep it as-is
             # This means the AI correctly generated the time in the user's timezone
         except Exception as e:
-            print(f"Warning: Failed to set user timezone {user_timezone}: {e}")
+            logger.warning("Warning: Failed to set user timezone %s: %s", user_timezone, e)
             # Continue with the datetime as-is
+            tz_error = e
 
         # Validate: do NOT allow scheduling in the past. Return error if invalid.
-        try:
-            now_user = datetime.now(time_to_execute.tzinfo) if time_to_execute.tzinfo else datetime.now(ZoneInfo(user_timezone))
+        # time_to_execute is only still naive here if the user's timezone could not be resolved.
+        error_msg = None
+        if time_to_execute.tzinfo is None:
+            error_msg = f"Failed to validate time: {time_to_execute.isoformat()}. Error: {tz_error}. Please ask the user for a valid future time."
+        else:
+            now_user = datetime.now(time_to_execute.tzinfo)
             if time_to_execute <= now_user:
-                msg = f"Invalid time: {time_to_execute.isoformat()} is in the past relative to now ({now_user.isoformat()}) in timezone {user_timezone}. Please ask the user for a new time."
-                print(f"⚠️ {msg}")
-                raise ValueError(msg)
-        except Exception as e:
-            # If validation fails (past time or error), do NOT create the task
-            error_msg = str(e) if isinstance(e, ValueError) else f"Failed to validate time: {time_to_execute.isoformat()}. Error: {str(e)}. Please ask the user for a valid future time."
-            print(f"⚠️ {error_msg}")
-            return json.dumps({
+                error_msg = f"Invalid time: {time_to_execute.isoformat()} is in the past relative to now ({now_user.isoformat()}) in timezone {user_timezone}. Please ask the user for a new time."
+        if error_msg:
+            # If validation fails (past time or unknown timezone), do NOT create the task
+            logger.info("⚠️ %s", error_msg)
+            return dumps({
                 "success": False,
                 "message": error_msg,
                 "task_id": None,
@@ -192,62 +225,121 @@ class CreateTasksToolAgent:
         # Hardcoded UID for now
         user_id = "2ba330c0-a999-46f8-ba2c-855880bdcf5b"
 
-        # Generate UUID for task_id
-        task_id = str(uuid.uuid4())
-
-        # Create taskInfo JSON object
-        task_info = {"info": task_info}
-
-        # Set initial status
-        status = "pending"
+        task = {
+            # Generate UUID for task_id
+            "task_id": str(uuid.uuid4()),
+            "user_id": user_id,
+            # Create taskInfo JSON object
+            "task_info": {"info": task_info},
+            # Set initial status
+            "status": "pending",
+            "time_to_execute": time_to_execute,
+        }
 
-        # Execute PostgreSQL query to insert task
         try:
-            query = """
-                INSERT INTO tasks (task_id, user_id, "task_info", status, time_to_execute)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            rows_affected = execute_update(query, (task_id, user_id, Json(task_info), status, time_to_execute))
-            print(f"Task created. Rows affected: {rows_affected}")
-            
-            # Enqueue task to Service Bus
-            enqueue_result = None
-            try:
-                enqueue_result = enqueue_task(
-                    task_id=task_id,
-                    user_id=user_id,
-                    task_info=task_info,
-                    time_to_execute=time_to_execute.isoformat()
-                )
-                print(f"Task enqueued to Service Bus: {enqueue_result}")
-                # Persist Service Bus sequence_id to task row when present (scheduled messages only)
-                if enqueue_result and enqueue_result.get("sequence_id") is not None:
-                    try:
-                        update_task_enqueue_sequence_id(task_id, enqueue_result["sequence_id"])
-                    except Exception as update_err:
-                        print(f"Warning: Failed to update enqueue_sequence_id for task {task_id}: {update_err}")
-            except Exception as e:
-                print(f"Warning: Failed to enqueue task to Service Bus: {e}")
-                # Continue even if enqueueing fails - task is already in database
-            
-            response_data = {
-                "success": True,
-                "message": f"Task '{task_info}' created successfully. We don't need another create task tool call for this user instruction unless the user has asked for more tasks than this one you just created.",
-                "task_id": task_id,
-                "task_info": task_info,
-                "status": status,
-                "time_to_execute": time_to_execute.isoformat(),
-            }
-            
-            # Add enqueue result if available
-            if enqueue_result:
-                response_data["enqueue_result"] = enqueue_result
-            
-            return json.dumps(response_data)
+            return dumps(self.execute_many([task])[0])
         except Exception as e:
-            print(f"Error creating task in database: {e}")
-            return json.dumps({
+            logger.error("Error creating task in database: %s", e)
+            return dumps({
                 "success": False,
                 "message": f"Error creating task: {str(e)}",
             })
 
+    def _extract_task_with_model(self, chat_history, most_recent_user_message, created_tasks, user_name, current_time_str, current_date_str, timezone):
+        """
+        Ask the model for the next task to create from the most recent user message.
+
+        Returns:
+            tuple: (task_info, time_to_execute ISO string) as returned by the model
+        """
+        # Collected and joined once rather than grown with +=
+        parts = [
+            f"Given the chat history in the user message, the assistant has decided to use the {self.name}."
+            f"\n\nUSER CONTEXT:\n- User name: {user_name}\n- Current time: {current_time_str}\n- Current date: {current_date_str}\n- User timezone: {timezone}"
+        ]
+        
+        if most_recent_user_message:
+            parts.append(
+                f"\n\n⚠️ CRITICAL: The MOST RECENT user message is: \"{most_recent_user_message}\""
+                f"\n- You MUST ONLY extract tasks from this message. Do NOT extract tasks from previous messages or make up tasks."
+                f"\n- If the user said 'brush my teeth at 6am and eat breakfast at 11am', extract ONLY 'brush my teeth' or 'eat breakfast' - nothing else."
+                f"\n\n⚠️ TIME INTERPRETATION FOR THIS REQUEST:"
+                f"\n- Current date is: {current_date_str}"
+                f"\n- If the user says 'tonight', 'today', 'this evening', etc., or if no relative phrase is provided, they mean {current_date_str} - NOT tomorrow."
+                f"\n- ONLY use tomorrow's date if the user explicitly says 'tomorrow'."
+            )
+        
+        if created_tasks:
+            parts.append(
+                f"\n\n⚠️ CRITICAL: The following tasks have ALREADY been created from the most recent user message: {sorted(created_tasks)}"
+                f"\n- You MUST extract a DIFFERENT task from the MOST RECENT user message that has NOT been created yet."
+                f"\n- If all tasks from the most recent user message have been created, return an error."
+            )
+        
+        parts.append(_TASK_EXTRACTION_RULES)
+        system_content = "".join(parts)
+
+        logger.debug("System content: %s", system_content)
+        
+        # The chat history goes in its own trailing message so the system prompt doesn't start
+        # with per-request content. Only a compact summary of the recent window is sent; the most
+        # recent user message and created_tasks (computed from the full history) are spelled out above.
+        messages = [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": f"Chat history:\n{summarize_chat_history(chat_history)}"},
+        ]
+
+        response = gemini_response_to_openai_like(call_gemini(messages, [self.selecting_tool]))
+        arguments = loads(response.choices[0].message.tool_calls[0].function.arguments)
+        task_info = arguments["task_info"]
+        time_to_execute_str = arguments["time_to_execute"]
+        return task_info, time_to_execute_str
+
+    def execute_many(self, tasks):
+        """
+        Insert already-extracted tasks in a single round-trip, then enqueue them to Service Bus together
+        in the background.
+
+        Args:
+            tasks: List of dicts with task_id, user_id, task_info (dict), status and
+                time_to_execute (timezone-aware datetime)
+
+        Returns:
+            list: One create_tasks_tool response dict per task, in input order
+
+        Raises:
+            psycopg2.Error: If the insert fails (no task is created)
+        """
+        # Execute PostgreSQL query to insert tasks
+        query = """
+            INSERT INTO tasks (task_id, user_id, "task_info", status, time_to_execute)
+            VALUES %s
+        """
+        rows = [
+            (task["task_id"], task["user_id"], Json(task["task_info"]), task["status"], task["time_to_execute"])
+            for task in tasks
+        ]
+        rows_affected = execute_values_update(query, rows)
+        logger.debug("Tasks created. Rows affected: %s", rows_affected)
+
+        # Enqueueing is best-effort (the tasks are already in the database), so it runs in the
+        # background instead of delaying the tool response
+        # Keyed by task so a later edit's cancel / re-enqueue runs after the sequence id is written
+        submit_task_work(
+            [task["task_id"] for task in tasks], _enqueue_created_tasks, tasks
+        ).add_done_callback(_log_enqueue_failure)
+
+        results = []
+        for task in tasks:
+            # Name the task by its text, not the {"info": ...} dict stored in the database
+            task_info_text = task["task_info"].get("info", "")
+            response_data = {
+                "success": True,
+                "message": f"Task '{task_info_text}' created successfully. We don't need another create task tool call for this user instruction unless the user has asked for more tasks than this one you just created.",
+                "task_id": task["task_id"],
+                "task_info": task["task_info"],
+                "status": task["status"],
+                "time_to_execute": task["time_to_execute"].isoformat(),
+            }
+            results.append(response_data)
+        return results
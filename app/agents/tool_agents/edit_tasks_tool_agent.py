@@ -1,6 +1,5 @@
 import json
 from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
 from database import execute_query, execute_update
 from psycopg2.extras import Json
 
@@ -10,13 +9,54 @@ from enqueue.edit_task_enqueue import (
     reenqueue_task_after_edit_safe,
     cancel_scheduled_task_for_task_id_safe,
 )
+from enqueue.task_work_queue import submit_task_work
 
+from ..utils.datetime_utils import get_zoneinfo, parse_iso_datetime
 from ..utils.task_extraction_utils import extract_tasks_from_chat_history
 
+
+def _log_service_bus_failure(future):
+    # Service Bus failures are non-fatal - the edit is already in the database
+    error = future.exception()
+    if error is not None:
+        print(f"Warning: Failed to update Service Bus after edit: {error}")
+
+
 class EditTasksToolAgent:
     name = "edit_tasks_tool"
     description = "Edit an existing task's status, task_info, or time_to_execute. Use this tool when: (1) the user CLEARLY indicates they have completed a task (e.g., 'I completed X', 'I finished Y', 'I did Z', 'I took my medicine', 'just did it') to mark it as completed, OR (2) the user wants to defer the task (e.g., 'I'll do it later', 'not yet', 'I need more time', 'I haven't finished', 'I'm not done yet', 'remind me later') to defer it by 5 minutes. IMPORTANT: Do NOT use this tool if the user ONLY says 'thanks' or 'okay' without clear completion or deferral indication - in those cases, ask for clarification instead. This tool should only be called once the agent has a specific task_id from chat history / previous tool calls (from get_tasks_tool or create_tasks_tool results). NEVER use this tool to create new tasks or to read task information. NEVER use this tool if the task_id is not available in the chat history."
 
+    selecting_tool = {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "task_id": {
+                        "type": "string",
+                        "description": "The specific task_id of the task to edit. This MUST be extracted from previous tool call results in the chat history (from get_tasks_tool or create_tasks_tool). If no task_id is available in chat history, you cannot proceed and must indicate this is an error.",
+                    },
+                    "status": {
+                        "type": "string",
+                        "enum": ["pending", "completed"],
+                        "description": "The new status for the task. Use 'completed' if the user wants to mark the task as done/complete/finished. Use 'pending' if the user wants to mark the task as pending/uncomplete/reopen. CRITICAL: When marking as completed, ONLY include this field - do NOT include task_info or time_to_execute. Only include this field if the user wants to change the status.",
+                    },
+                    "task_info": {
+                        "type": "string",
+                        "description": "The new task description/information. Only include this field if the user wants to change the task description.",
+                    },
+                    "time_to_execute": {
+                        "type": "string",
+                        "description": "The new time when the task should be executed. This MUST be in ISO format with timezone (e.g., '2026-01-17T16:00:00-08:00' for 4pm PST). Only include this field if the user wants to change the execution time.",
+                    },
+                },
+                "required": ["task_id"],
+            },
+        }
+    }
+
     def get_tool_description(self):
         return self.description
 
@@ -99,7 +139,7 @@ class EditTasksToolAgent:
                 time_to_execute_display = task.get('time_to_execute', 'N/A')
                 if time_to_execute_display != 'N/A' and isinstance(time_to_execute_display, datetime):
                     try:
-                        user_tz = ZoneInfo(timezone)
+                        user_tz = get_zoneinfo(timezone)
                         # Convert to user's timezone (no UTC assumptions)
                         if time_to_execute_display.tzinfo:
                             # Has timezone info - convert to user's timezone
@@ -181,37 +221,7 @@ class EditTasksToolAgent:
             {"role": "system", "content": system_content},
         ]
 
-        selecting_tool = {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {
-                            "type": "string",
-                            "description": "The specific task_id of the task to edit. This MUST be extracted from previous tool call results in the chat history (from get_tasks_tool or create_tasks_tool). If no task_id is available in chat history, you cannot proceed and must indicate this is an error.",
-                        },
-                        "status": {
-                            "type": "string",
-                            "enum": ["pending", "completed"],
-                            "description": "The new status for the task. Use 'completed' if the user wants to mark the task as done/complete/finished. Use 'pending' if the user wants to mark the task as pending/uncomplete/reopen. CRITICAL: When marking as completed, ONLY include this field - do NOT include task_info or time_to_execute. Only include this field if the user wants to change the status.",
-                        },
-                        "task_info": {
-                            "type": "string",
-                            "description": "The new task description/information. Only include this field if the user wants to change the task description.",
-                        },
-                        "time_to_execute": {
-                            "type": "string",
-                            "description": f"The new time when the task should be executed. This MUST be in ISO format with timezone (e.g., '2026-01-17T16:00:00-08:00' for 4pm PST). Only include this field if the user wants to change the execution time.",
-                        },
-                    },
-                    "required": ["task_id"],
-                },
-            }
-        }
-        response = gemini_response_to_openai_like(call_gemini(messages, [selecting_tool]))
+        response = gemini_response_to_openai_like(call_gemini(messages, [self.selecting_tool]))
         arguments = json.loads(response.choices[0].message.tool_calls[0].function.arguments)
         task_id = arguments["task_id"]
         new_status = arguments.get("status")
@@ -313,7 +323,7 @@ class EditTasksToolAgent:
             time_to_execute_dt = None
             if new_time_to_execute_str:
                 # Parse the time string
-                time_to_execute_dt = datetime.fromisoformat(new_time_to_execute_str.replace('Z', '+00:00'))
+                time_to_execute_dt = parse_iso_datetime(new_time_to_execute_str)
                 
                 # Preserve the timezone as provided - DB doesn't enforce UTC
                 # If timezone-naive, assume it's in user's timezone
@@ -322,7 +332,7 @@ class EditTasksToolAgent:
                     if user_config:
                         user_timezone = user_config.get("timezone", "UTC")
                     try:
-                        user_tz = ZoneInfo(user_timezone) if user_timezone.upper() != "UTC" else timezone.utc
+                        user_tz = get_zoneinfo(user_timezone) if user_timezone.upper() != "UTC" else timezone.utc
                         time_to_execute_dt = time_to_execute_dt.replace(tzinfo=user_tz)
                     except Exception as e:
                         print(f"Warning: Failed to set user timezone {user_timezone}: {e}")
@@ -376,24 +386,26 @@ class EditTasksToolAgent:
             
             updated_task = dict(updated_tasks[0])
             
-            # Service Bus: cancel existing scheduled message and/or re-enqueue with updated payload
+            # Service Bus: cancel existing scheduled message and/or re-enqueue with updated payload.
+            # Submitted in the background so the response doesn't wait on Service Bus.
             if cancel_scheduled_task_for_task_id_safe and new_status == "completed":
-                cancel_scheduled_task_for_task_id_safe(task_id, user_id)
+                submit_task_work(
+                    [task_id], cancel_scheduled_task_for_task_id_safe, task_id, user_id
+                ).add_done_callback(_log_service_bus_failure)
             elif reenqueue_task_after_edit_safe and (new_time_to_execute_str or new_task_info) and updated_task.get("status") == "pending":
                 time_to_execute_iso = updated_task.get("time_to_execute")
                 if time_to_execute_iso is not None and hasattr(time_to_execute_iso, "isoformat"):
                     time_to_execute_iso = time_to_execute_iso.isoformat()
                 elif time_to_execute_iso is not None:
                     time_to_execute_iso = str(time_to_execute_iso)
-                try:
-                    reenqueue_task_after_edit_safe(
-                        task_id=task_id,
-                        user_id=user_id,
-                        task_info=updated_task.get("task_info"),
-                        time_to_execute=time_to_execute_iso,
-                    )
-                except Exception as e:
-                    print(f"Warning: Failed to re-enqueue task after edit: {e}")
+                submit_task_work(
+                    [task_id],
+                    reenqueue_task_after_edit_safe,
+                    task_id=task_id,
+                    user_id=user_id,
+                    task_info=updated_task.get("task_info"),
+                    time_to_execute=time_to_execute_iso,
+                ).add_done_callback(_log_service_bus_failure)
 
             # Convert datetime to ISO format if present
             task_info = updated_task.get("task_info")
@@ -6,11 +6,37 @@ import os
 from database import execute_query
 
 from ..gemini_client import call_gemini, gemini_response_to_openai_like
+from ..utils.datetime_utils import get_zoneinfo, parse_iso_datetime
 
 class GetTasksToolAgent:
     name = "get_tasks_tool"
     description = "Get a list of tasks for a given time range. Use this tool ONLY for read-only queries like 'What tasks do I have', 'Show me my tasks', 'When do I have X', etc. NEVER use this tool to create tasks."
 
+    selecting_tool = {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "start_time": {
+                        "type": "string",
+                        "description": "The start time of the time range to get tasks for. This should be in the format of a python datetime with timezone. For 'today', use 00:00:00 of the current calendar date. For 'tomorrow', use 00:00:00 of the next calendar date.",
+                    },
+                    "end_time": {
+                        "type": "string",
+                        "description": "The end time of the time range to get tasks for. This should be in the format of a python datetime with timezone. For 'today', use 23:59:59 of the current calendar date. For 'tomorrow', use 23:59:59 of the next calendar date.",
+                    },
+                },
+                "required": ["start_time", "end_time"],
+            },
+        }
+    }
+
+    # Read-only, so it can run alongside other parallel-safe tools selected in the same turn
+    parallel_safe = True
+
     def get_tool_description(self):
         return self.description
 
@@ -42,28 +68,7 @@ class GetTasksToolAgent:
             {"role": "system", "content": system_content},
         ]
 
-        selecting_tool = {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "start_time": {
-                            "type": "string",
-                            "description": "The start time of the time range to get tasks for. This should be in the format of a python datetime with timezone. For 'today', use 00:00:00 of the current calendar date. For 'tomorrow', use 00:00:00 of the next calendar date.",
-                        },
-                        "end_time": {
-                            "type": "string",
-                            "description": "The end time of the time range to get tasks for. This should be in the format of a python datetime with timezone. For 'today', use 23:59:59 of the current calendar date. For 'tomorrow', use 23:59:59 of the next calendar date.",
-                        },
-                    },
-                    "required": ["start_time", "end_time"],
-                },
-            }
-        }
-        response = gemini_response_to_openai_like(call_gemini(messages, [selecting_tool]))
+        response = gemini_response_to_openai_like(call_gemini(messages, [self.selecting_tool]))
         arguments = json.loads(response.choices[0].message.tool_calls[0].function.arguments)
         start_time_str = arguments["start_time"]
         end_time_str = arguments["end_time"]
@@ -71,8 +76,8 @@ class GetTasksToolAgent:
         print(f"End time: {end_time_str}")
 
         # Parse the string dates into datetime objects
-        start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-        end_time = datetime.fromisoformat(end_time_str.replace('Z', '+00:00'))
+        start_time = parse_iso_datetime(start_time_str)
+        end_time = parse_iso_datetime(end_time_str)
 
         # Get user_id from user_config
         user_id = None
@@ -93,7 +98,7 @@ class GetTasksToolAgent:
                     user_tz = timezone.utc
                 else:
                     try:
-                        user_tz = ZoneInfo(user_timezone)
+                        user_tz = get_zoneinfo(user_timezone)
                     except Exception:
                         # Fallback to UTC if timezone is invalid
                         user_tz = timezone.utc
@@ -109,7 +114,7 @@ class GetTasksToolAgent:
                     user_tz = timezone.utc
                 else:
                     try:
-                        user_tz = ZoneInfo(user_timezone)
+                        user_tz = get_zoneinfo(user_timezone)
                     except Exception:
                         # Fallback to UTC if timezone is invalid
                         user_tz = timezone.utc
@@ -146,7 +151,7 @@ class GetTasksToolAgent:
                     if user_timezone.upper() == "UTC":
                         user_tz = timezone.utc
                     else:
-                        user_tz = ZoneInfo(user_timezone)
+                        user_tz = get_zoneinfo(user_timezone)
                 except Exception as e:
                     print(f"Warning: Failed to get user timezone {user_timezone}: {e}")
             
@@ -16,6 +16,27 @@ class SendMessageToolAgent:
         "Do NOT use for creating tasks or reminders; use create_tasks_tool for those."
     )
 
+    selecting_tool = {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "message": {
+                        "type": "string",
+                        "description": "The exact message body to send to the user's caretaker. Use the user's wording.",
+                    },
+                },
+                "required": ["message"],
+            },
+        },
+    }
+
+    # Only writes to the messages table, so it can run alongside other parallel-safe tools
+    parallel_safe = True
+
     def get_tool_description(self):
         return self.description
 
@@ -66,25 +87,7 @@ class SendMessageToolAgent:
             {"role": "system", "content": system_content},
         ]
 
-        selecting_tool = {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "message": {
-                            "type": "string",
-                            "description": "The exact message body to send to the user's caretaker. Use the user's wording.",
-                        },
-                    },
-                    "required": ["message"],
-                },
-            },
-        }
-
-        response = gemini_response_to_openai_like(call_gemini(messages, [selecting_tool]))
+        response = gemini_response_to_openai_like(call_gemini(messages, [self.selecting_tool]))
         tool_calls = getattr(response.choices[0].message, "tool_calls", None)
         if not tool_calls or len(tool_calls) == 0:
             return json.dumps({
@@ -0,0 +1,84 @@
+"""Utility functions for trimming chat history before it is sent to the model."""
+
+# Number of trailing chat history messages included in a model prompt
+PROMPT_WINDOW_SIZE = 20
+
+# Tools whose latest output stays in the prompt even after it scrolls out of the window:
+# it carries the task ids and created tasks later tool decisions depend on
+PINNED_TOOLS = frozenset(("create_tasks_tool", "get_tasks_tool"))
+
+
+def window_chat_history(chat_history, max_messages=PROMPT_WINDOW_SIZE, pinned_tools=PINNED_TOOLS):
+    """Trim chat history to the messages a model prompt needs.
+
+    Keeps the last max_messages messages, extended back to the most recent user message if that
+    is older, plus the most recent output of each pinned tool that fell outside that window.
+    Pinned messages keep their original order ahead of the window.
+
+    Args:
+        chat_history: List of chat history messages
+        max_messages: Number of trailing messages to keep
+        pinned_tools: Tool names whose most recent output is always kept
+
+    Returns:
+        list: chat_history itself when it already fits, otherwise a trimmed copy
+    """
+    if len(chat_history) <= max_messages:
+        return chat_history
+
+    start = len(chat_history) - max_messages
+    # Never cut into the current turn: keep everything from the most recent user message on
+    for idx in range(len(chat_history) - 1, -1, -1):
+        if chat_history[idx].get("role") == "user":
+            start = min(start, idx)
+            break
+
+    missing = set(pinned_tools)
+    for idx in range(start, len(chat_history)):
+        missing.discard(chat_history[idx].get("name"))
+
+    pinned = []
+    idx = start - 1
+    while missing and idx >= 0:
+        msg = chat_history[idx]
+        name = msg.get("name")
+        if name in missing:
+            missing.discard(name)
+            pinned.append(msg)
+        idx -= 1
+    pinned.reverse()
+
+    return pinned + chat_history[start:]
+
+
+# Number of trailing messages, and characters per message, in a chat history summary
+SUMMARY_MAX_MESSAGES = 10
+SUMMARY_MAX_CHARS = 500
+
+
+def summarize_chat_history(chat_history, max_messages=SUMMARY_MAX_MESSAGES, max_chars=SUMMARY_MAX_CHARS):
+    """Render the recent chat history as compact "role (name): content" lines for a prompt.
+
+    Uses window_chat_history to pick the messages (so the current turn and pinned tool
+    outputs are kept) and truncates each assistant / tool message's content to max_chars.
+    User messages are kept whole, since they carry the request being handled.
+
+    Args:
+        chat_history: List of chat history messages
+        max_messages: Number of trailing messages to keep
+        max_chars: Maximum characters of content kept per non-user message
+
+    Returns:
+        str: One line per message, oldest first
+    """
+    def _line(msg):
+        content = msg.get("content")
+        if not isinstance(content, str):
+            content = "" if content is None else str(content)
+        if len(content) > max_chars and msg.get("role") != "user":
+            content = content[:max_chars] + "…"
+        name = msg.get("name")
+        speaker = f"{msg.get('role', 'unknown')} ({name})" if name else msg.get("role", "unknown")
+        return f"{speaker}: {content}"
+
+    return "\n".join(_line(msg) for msg in window_chat_history(chat_history, max_messages=max_messages))
@@ -0,0 +1,39 @@
+"""Utility functions for parsing model-returned datetimes and resolving user timezones."""
+import functools
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+
+def parse_iso_datetime(value):
+    """Parse an ISO 8601 datetime string, including a trailing "Z" for UTC.
+
+    Uses ciso8601's C parser when it is installed, otherwise Python 3.11's
+    datetime.fromisoformat (which also accepts "Z", so no "+00:00" rewrite is needed).
+
+    Args:
+        value: ISO 8601 datetime string (e.g. "2026-01-17T16:00:00-08:00" or "2026-01-17T16:00:00Z")
+
+    Returns:
+        datetime: Timezone-aware if the string carries an offset, otherwise naive
+
+    Raises:
+        ValueError: If value is not valid ISO 8601
+    """
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime(value)
+    return datetime.fromisoformat(value)
+
+
+@functools.lru_cache(maxsize=512)
+def get_zoneinfo(name):
+    """Return the ZoneInfo for an IANA timezone name, memoized per name.
+
+    Raises:
+        zoneinfo.ZoneInfoNotFoundError: If name is not a known timezone
+    """
+    return ZoneInfo(name)
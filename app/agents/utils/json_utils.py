@@ -0,0 +1,40 @@
+"""JSON helpers for the agent hot path, using orjson when it is installed."""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep catching the stdlib error.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """Parse a JSON document from str or bytes.
+    
+    Args:
+        data: The JSON text to parse
+        
+    Returns:
+        The decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, sort_keys=False, default=None):
+    """Serialize obj to a compact JSON string.
+    
+    Args:
+        obj: The object to serialize
+        sort_keys: Whether to emit dictionary keys in sorted order
+        default: Optional callable used for objects JSON cannot represent natively
+        
+    Returns:
+        str: The JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+    return json.dumps(obj, sort_keys=sort_keys, default=default, ensure_ascii=False, separators=(",", ":"))
@@ -1,154 +1,150 @@
 """Utility functions for processing scratchpad entries and converting them to chat history."""
 
-from .text_utils import normalize_text, should_skip_fragmented_entry
+from .text_utils import has_fragmentation, normalize_text, should_skip_fragmented_entry
 
 # Must match ``Scratchpad.SPEECH_PHASE_PRE_TOOL_ACK`` (agent rows tagged during Live tool turns).
 SPEECH_PHASE_PRE_TOOL_ACK = "interstitial_ack"
 
+# Scratchpad formats that carry spoken/typed content (as opposed to function calls)
+TEXTUAL_FORMATS = frozenset(("text", "audio"))
+
+ALREADY_PROCESSED_MESSAGE = "This request has already been processed. Please check the previous response."
+
+
+def _completed_response_kind(entry):
+    """Classify an entry that follows a user input as a completed response.
 
-def check_if_already_processed(scratchpad, user_input):
-    """Check if this exact input was already processed (to prevent infinite loops).
-    
-    Checks ALL instances of this user input in the scratchpad, not just the most recent.
-    If any instance has a response after it, we should skip processing.
-    
-    Args:
-        scratchpad: List of scratchpad entries
-        user_input: The current user input to check
-        
     Returns:
-        str or None: Returns a skip message if duplicate is found, None otherwise
+        str or None: "function_call" or "assistant response" if the entry shows the input was
+        already handled, None otherwise
     """
-    if not scratchpad:
+    fmt = entry.get("format")
+    if entry.get("source") != "agent":
+        return None
+    # Tool outcomes only — not think_and_repeat_output (that record is written as soon
+    # as the Live tool returns, before the spoken answer, so it would false-positive).
+    if fmt == "function_call":
+        response = entry.get("response")
+        if entry.get("name") != "think_and_repeat_output" and response and response.get("result"):
+            return "function_call"
         return None
-    
-    # Normalize current user input for duplicate detection
-    normalized_current = normalize_text(user_input)
-    
-    # Check ALL instances of this user input in the scratchpad, not just the most recent
-    # If any instance has a response after it, we should skip processing
-    for i, entry in enumerate(scratchpad):
-        if entry.get("format") in ["text", "audio"] and entry.get("source") == "user" and entry.get("content"):
-            entry_content = entry["content"]
-            normalized_entry = normalize_text(entry_content)
-            if normalized_current == normalized_entry:
-                # Check if there's already a completed response after this user input
-                # Look ahead in scratchpad to see if this was already processed
-                for later_entry in scratchpad[i + 1:]:
-                    # Tool outcomes only — not think_and_repeat_output (that record is written as soon
-                    # as the Live tool returns, before the spoken answer, so it would false-positive).
-                    if (
-                        later_entry.get("format") == "function_call"
-                        and later_entry.get("source") == "agent"
-                        and later_entry.get("name") != "think_and_repeat_output"
-                        and later_entry.get("response")
-                        and later_entry.get("response").get("result")
-                    ):
-                        print(f"⚠️ Duplicate user input detected (already processed with function_call), skipping: {user_input[:50]}...")
-                        return "This request has already been processed. Please check the previous response."
-                    # Check for assistant responses that indicate completion (not just acknowledgments)
-                    if (later_entry.get("format") in ["text", "audio"] and 
-                        later_entry.get("source") == "agent" and 
-                        later_entry.get("content")):
-                        content = later_entry.get("content", "")
-                        # Pre-tool agent lines are tagged on commit (see Scratchpad interstitial window)
-                        if later_entry.get("speech_phase") == SPEECH_PHASE_PRE_TOOL_ACK:
-                            continue
-                        if len(content) > 20:
-                            print(f"⚠️ Duplicate user input detected (already processed with assistant response), skipping: {user_input[:50]}...")
-                            return "This request has already been processed. Please check the previous response."
-                    # If we encounter another user input before finding a response, stop checking this instance
-                    if later_entry.get("format") in ["text", "audio"] and later_entry.get("source") == "user":
-                        break
-    
+    # Check for assistant responses that indicate completion (not just acknowledgments)
+    if fmt in TEXTUAL_FORMATS:
+        content = entry.get("content")
+        # Pre-tool agent lines are tagged on commit (see Scratchpad interstitial window)
+        if content and len(content) > 20 and entry.get("speech_phase") != SPEECH_PHASE_PRE_TOOL_ACK:
+            return "assistant response"
     return None
 
 
-def build_chat_history_from_scratchpad(scratchpad, user_input):
-    """Convert scratchpad entries to chat history format.
-    
-    Processes scratchpad entries and converts them to a chat history format suitable
-    for the agent. Skips fragmented/incomplete audio transcriptions and includes function
-    call responses so the agent knows what actions were already taken.
-    
+def _is_user_input(entry):
+    return entry.get("format") in TEXTUAL_FORMATS and entry.get("source") == "user"
+
+
+def _append_chat_history_entry(chat_history, entry, final_normalized, final_has_fragmentation):
+    """Convert a single scratchpad entry and append it to chat_history (if it should be included)."""
+    fmt = entry.get("format")
+    source = entry.get("source")
+    if fmt in TEXTUAL_FORMATS:
+        entry_content = entry.get("content")
+        if not entry_content:
+            return
+        # User inputs
+        if source == "user":
+            # Skip fragmented/incomplete audio transcriptions
+            if should_skip_fragmented_entry(entry_content, final_normalized, final_has_fragmentation):
+                return
+
+            # ASR / scratchpad can repeat the same user line; avoid back-to-back duplicates
+            if chat_history:
+                last = chat_history[-1]
+                if last.get("role") == "user" and normalize_text(last.get("content", "")) == normalize_text(entry_content):
+                    return
+
+            chat_history.append({
+                "role": "user",
+                "content": entry_content
+            })
+        # Agent responses (skip interstitial ack rows — not part of tool-relevant dialog)
+        elif source == "agent":
+            if entry.get("speech_phase") == SPEECH_PHASE_PRE_TOOL_ACK:
+                return
+            chat_history.append({
+                "role": "assistant",
+                "content": entry_content
+            })
+    # Include function call responses so the agent knows what actions were already taken
+    elif fmt == "function_call" and source == "agent":
+        # Include function call responses - these contain the result of tool execution
+        # This helps the agent understand what actions have already been completed
+        response = entry.get("response") or {}
+        # The result contains information about what was done (e.g., "Task created successfully")
+        result_content = response.get("result")
+        if not result_content:
+            return
+        tool_name = entry.get("name", "tool")
+
+        # For think_and_repeat_output, include the actual tool responses if available
+        # This allows tools like edit_tasks_tool to find task_ids from previous tool calls
+        if tool_name == "think_and_repeat_output":
+            # First, include the actual tool responses (create_tasks_tool, get_tasks_tool, etc.)
+            # These are stored in the response's tool_responses field
+            for tool_response in response.get("tool_responses") or ():
+                if isinstance(tool_response, dict) and tool_response.get("name") and tool_response.get("content"):
+                    chat_history.append({
+                        "role": "assistant",
+                        "name": tool_response["name"],
+                        "content": tool_response["content"]
+                    })
+
+        # Then include the formatted result message (for other function calls, just the result)
+        chat_history.append({
+            "role": "assistant",
+            "content": f"[Completed in previous interaction via {tool_name}]: {result_content}"
+        })
+
+
+def _already_processed(user_input, kind):
+    print(f"⚠️ Duplicate user input detected (already processed with {kind}), skipping: {user_input[:50]}...")
+    return ALREADY_PROCESSED_MESSAGE
+
+
+def scan_scratchpad(scratchpad, user_input):
+    """Check for an already-processed input and convert the scratchpad to chat history in one pass.
+
+    The input counts as already processed if ANY earlier instance of it (not just the most
+    recent) is followed by a completed response before the next user input, which prevents
+    infinite loops. Fragmented/incomplete audio transcriptions are skipped, and function call
+    responses are included so the agent knows what actions were already taken.
+
     Args:
         scratchpad: List of scratchpad entries
-        user_input: The current user input (used for filtering fragmented entries)
-        
+        user_input: The current user input
+
     Returns:
-        list: Chat history in the format expected by the agent
+        tuple: (duplicate message or None, chat history). The chat history is empty when a
+        duplicate is found.
     """
     chat_history = []
-    
+
     if not scratchpad:
-        return chat_history
-    
+        return None, chat_history
+
+    final_normalized = normalize_text(user_input)
+    final_has_fragmentation = bool(user_input) and has_fragmentation(user_input)
+
+    # "armed" means we are between a matching user input and the next user input, i.e. inside
+    # the window where a completed response marks the input as processed
+    armed = False
     for entry in scratchpad:
-        if entry.get("format") in ["text", "audio"]:
-            # User inputs
-            if entry.get("source") == "user" and entry.get("content"):
-                entry_content = entry["content"]
-                
-                # Skip fragmented/incomplete audio transcriptions
-                if should_skip_fragmented_entry(entry_content, user_input):
-                    continue
-
-                # ASR / scratchpad can repeat the same user line; avoid back-to-back duplicates
-                nu = normalize_text(entry_content)
-                if (
-                    chat_history
-                    and chat_history[-1].get("role") == "user"
-                    and normalize_text(chat_history[-1].get("content", "")) == nu
-                ):
-                    continue
-
-                chat_history.append({
-                    "role": "user",
-                    "content": entry_content
-                })
-            # Agent responses (skip interstitial ack rows — not part of tool-relevant dialog)
-            elif entry.get("source") == "agent" and entry.get("content"):
-                if entry.get("speech_phase") == SPEECH_PHASE_PRE_TOOL_ACK:
-                    continue
-                chat_history.append({
-                    "role": "assistant",
-                    "content": entry["content"]
-                })
-        # Include function call responses so the agent knows what actions were already taken
-        elif entry.get("format") == "function_call" and entry.get("source") == "agent":
-            # Include function call responses - these contain the result of tool execution
-            # This helps the agent understand what actions have already been completed
-            if entry.get("response") and entry.get("response").get("result"):
-                # The result contains information about what was done (e.g., "Task created successfully")
-                result_content = entry["response"]["result"]
-                tool_name = entry.get("name", "tool")
-                
-                # For think_and_repeat_output, include the actual tool responses if available
-                # This allows tools like edit_tasks_tool to find task_ids from previous tool calls
-                if tool_name == "think_and_repeat_output":
-                    # First, include the actual tool responses (create_tasks_tool, get_tasks_tool, etc.)
-                    # These are stored in the response's tool_responses field
-                    if entry.get("response").get("tool_responses"):
-                        for tool_response in entry["response"]["tool_responses"]:
-                            if isinstance(tool_response, dict) and tool_response.get("name") and tool_response.get("content"):
-                                chat_history.append({
-                                    "role": "assistant",
-                                    "name": tool_response["name"],
-                                    "content": tool_response["content"]
-                                })
-                    
-                    # Then include the formatted result message
-                    tool_context = f"[Completed in previous interaction via {tool_name}]: {result_content}"
-                    chat_history.append({
-                        "role": "assistant",
-                        "content": tool_context
-                    })
-                else:
-                    # For other function calls, just include the result
-                    tool_context = f"[Completed in previous interaction via {tool_name}]: {result_content}"
-                    chat_history.append({
-                        "role": "assistant",
-                        "content": tool_context
-                    })
-    
-    return chat_history
+        if armed:
+            kind = _completed_response_kind(entry)
+            if kind:
+                return _already_processed(user_input, kind), []
+        # Any user input closes the current window; a matching one opens a new window
+        if _is_user_input(entry):
+            armed = bool(entry.get("content")) and normalize_text(entry["content"]) == final_normalized
+
+        _append_chat_history_entry(chat_history, entry, final_normalized, final_has_fragmentation)
+
+    return None, chat_history
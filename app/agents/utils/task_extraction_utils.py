@@ -2,6 +2,17 @@
 import json
 import re
 
+from .json_utils import loads, JSONDecodeError
+
+
+# Start of a get_tasks_tool JSON response embedded in text
+_TASKS_JSON_RE = re.compile(r'\{"tasks"\s*:\s*\[.*?\]', re.DOTALL)
+# Fallback field extraction for create_tasks_tool content that isn't valid JSON
+_TASK_ID_RE = re.compile(r'"task_id"\s*:\s*"([a-f0-9\-]+)"')
+_TASK_INFO_RE = re.compile(r'"task_info"\s*:\s*(\{[^}]+\})')
+_STATUS_RE = re.compile(r'"status"\s*:\s*"([^"]+)"')
+_TIME_TO_EXECUTE_RE = re.compile(r'"time_to_execute"\s*:\s*"([^"]+)"')
+
 
 def extract_tasks_from_content(content_str):
     """
@@ -28,7 +39,7 @@ def extract_tasks_from_content(content_str):
     try:
         # Strategy 1: Try to parse the entire content as JSON
         try:
-            parsed = json.loads(content_str)
+            parsed = loads(content_str)
             if isinstance(parsed, dict):
                 # Check if it's a get_tasks_tool response
                 if parsed.get("tasks"):
@@ -73,14 +84,13 @@ def extract_tasks_from_content(content_str):
                     if isinstance(item, dict):
                         nested_tasks = extract_tasks_from_content(json.dumps(item))
                         tasks_found.extend(nested_tasks)
-        except json.JSONDecodeError:
+        except JSONDecodeError:
             pass
         
         # Strategy 2: Look for get_tasks_tool JSON responses embedded in text
         # Search for patterns like '{"tasks": [...]}'
         # Find all JSON objects that might contain tasks
-        json_pattern = r'\{"tasks"\s*:\s*\[.*?\]'
-        matches = re.finditer(json_pattern, content_str, re.DOTALL)
+        matches = _TASKS_JSON_RE.finditer(content_str)
         for match in matches:
             try:
                 # Try to find the complete JSON object
@@ -98,7 +108,7 @@ def extract_tasks_from_content(content_str):
                             break
                 if end > start:
                     json_str = content_str[start:end]
-                    parsed = json.loads(json_str)
+                    parsed = loads(json_str)
                     if parsed.get("tasks"):
                         for task in parsed.get("tasks", []):
                             if task.get("task_id"):
@@ -108,7 +118,7 @@ def extract_tasks_from_content(content_str):
                                     "status": task.get("status", "pending"),
                                     "time_to_execute": task.get("time_to_execute")
                                 })
-            except (json.JSONDecodeError, ValueError):
+            except (JSONDecodeError, ValueError):
                 continue
     except Exception:
         pass
@@ -138,7 +148,7 @@ def extract_tasks_from_chat_history(chat_history):
         # Check for get_tasks_tool results
         if msg.get("name") == "get_tasks_tool" and msg.get("content"):
             try:
-                content = json.loads(msg["content"]) if isinstance(msg["content"], str) else msg["content"]
+                content = loads(msg["content"]) if isinstance(msg["content"], str) else msg["content"]
                 if content.get("tasks"):
                     for task in content.get("tasks", []):
                         if task.get("task_id"):
@@ -158,31 +168,30 @@ def extract_tasks_from_chat_history(chat_history):
                 # If content is a string, try to parse it as JSON
                 if isinstance(content, str):
                     try:
-                        content = json.loads(content)
-                    except json.JSONDecodeError:
+                        content = loads(content)
+                    except JSONDecodeError:
                         # If JSON parsing fails, try regex extraction as fallback
-                        import re
-                        task_id_match = re.search(r'"task_id"\s*:\s*"([a-f0-9\-]+)"', content)
+                        task_id_match = _TASK_ID_RE.search(content)
                         if task_id_match:
                             task_id = task_id_match.group(1)
                             # Extract task_info if present
                             task_info = {}
-                            task_info_match = re.search(r'"task_info"\s*:\s*(\{[^}]+\})', content)
+                            task_info_match = _TASK_INFO_RE.search(content)
                             if task_info_match:
                                 try:
-                                    task_info = json.loads(task_info_match.group(1))
+                                    task_info = loads(task_info_match.group(1))
                                 except:
                                     pass
                             
                             # Extract status
                             status = "pending"
-                            status_match = re.search(r'"status"\s*:\s*"([^"]+)"', content)
+                            status_match = _STATUS_RE.search(content)
                             if status_match:
                                 status = status_match.group(1)
                             
                             # Extract time_to_execute
                             time_to_execute = None
-                            time_match = re.search(r'"time_to_execute"\s*:\s*"([^"]+)"', content)
+                            time_match = _TIME_TO_EXECUTE_RE.search(content)
                             if time_match:
                                 time_to_execute = time_match.group(1)
                             
@@ -215,7 +224,7 @@ def extract_tasks_from_chat_history(chat_history):
         # Check for edit_tasks_tool results (these contain the most up-to-date task state)
         if msg.get("name") == "edit_tasks_tool" and msg.get("content"):
             try:
-                content = json.loads(msg["content"]) if isinstance(msg["content"], str) else msg["content"]
+                content = loads(msg["content"]) if isinstance(msg["content"], str) else msg["content"]
                 if content.get("success") and content.get("task_id"):
                     available_tasks.append({
                         "task_id": content.get("task_id"),
@@ -245,7 +254,7 @@ def extract_tasks_from_chat_history(chat_history):
                     remaining = content[brace_start:]
                     # Try to parse as JSON
                     try:
-                        task_data = json.loads(remaining)
+                        task_data = loads(remaining)
                         if task_data.get("task_id") and not task_data.get("tasks"):
                             # This is an individual task object, not a tasks array
                             available_tasks.append({
@@ -254,7 +263,7 @@ def extract_tasks_from_chat_history(chat_history):
                                 "status": task_data.get("status", "pending"),
                                 "time_to_execute": task_data.get("time_to_execute")
                             })
-                    except json.JSONDecodeError:
+                    except JSONDecodeError:
                         pass
                 
                 # Strategy 2: If parsing from last { failed, try to find JSON object with proper brace matching
@@ -279,7 +288,7 @@ def extract_tasks_from_chat_history(chat_history):
                         if brace_end > brace_start:
                             try:
                                 json_str = content[brace_start:brace_end]
-                                task_data = json.loads(json_str)
+                                task_data = loads(json_str)
                                 if task_data.get("task_id") and not task_data.get("tasks"):
                                     # This is an individual task object, not a tasks array
                                     available_tasks.append({
@@ -288,7 +297,7 @@ def extract_tasks_from_chat_history(chat_history):
                                         "status": task_data.get("status", "pending"),
                                         "time_to_execute": task_data.get("time_to_execute")
                                     })
-                            except (json.JSONDecodeError, ValueError):
+                            except (JSONDecodeError, ValueError):
                                 pass
             except Exception as e:
                 # Silently continue if extraction fails
@@ -0,0 +1,68 @@
+"""Deterministic parsing of simple task-creation requests, used before falling back to the model."""
+import re
+from datetime import timedelta
+
+
+# "remind me to <task> [today|tomorrow|...] at <h>[:mm] am|pm [today|tomorrow|...]"
+# or "remind me to <task> in <n> minutes|hours". Only unambiguous single-task phrasings are
+# matched; anything else (multiple tasks, weekdays, 24h clock, recurring tasks) goes to the model.
+_PREFIX = r"(?:please\s+)?(?:remind\s+me\s+to|create\s+a\s+task\s+to|add\s+a\s+task\s+to|set\s+a\s+reminder\s+to|schedule\s+a\s+task\s+to)"
+_TASK = r"(?P<info>[a-z][a-z' ]*?)"
+_DAY = r"today|tonight|tomorrow|this\s+morning|this\s+afternoon|this\s+evening"
+_CLOCK_RE = re.compile(
+    rf"^{_PREFIX}\s+{_TASK}\s+(?:(?P<day>{_DAY})\s+)?at\s+(?P<hour>\d{{1,2}})(?::(?P<minute>\d{{2}}))?\s*(?P<meridiem>[ap])\.?m\.?(?:\s+(?P<day_after>{_DAY}))?[.!]?$",
+    re.IGNORECASE,
+)
+_RELATIVE_RE = re.compile(
+    rf"^{_PREFIX}\s+{_TASK}\s+in\s+(?P<amount>\d{{1,3}})\s+(?P<unit>minutes?|mins?|hours?|hrs?)[.!]?$",
+    re.IGNORECASE,
+)
+# Words that mean the task text still carries scheduling or a second task the patterns don't model
+_AMBIGUOUS_TASK_RE = re.compile(
+    rf"\b(?:and|then|every|daily|weekly|on|at|in|{_DAY}|morning|afternoon|evening|night|noon)\b",
+    re.IGNORECASE,
+)
+
+
+def try_parse_task(user_message, now):
+    """Parse a simple task-creation request without calling the model.
+
+    Handles "remind me to <task> [tomorrow] at 6:30pm" and "remind me to <task> in 20 minutes"
+    style requests. Times without a day phrase, or with "today"/"tonight"/"this evening",
+    stay on the current date (never rolled forward), matching the model prompt's rules.
+
+    Args:
+        user_message: The most recent user message
+        now: Timezone-aware current datetime in the user's timezone
+
+    Returns:
+        tuple: (task_info, timezone-aware datetime), or None if the message needs the model
+    """
+    if not user_message:
+        return None
+    text = " ".join(user_message.split())
+
+    match = _RELATIVE_RE.match(text)
+    if match:
+        info = match.group("info").strip()
+        if _AMBIGUOUS_TASK_RE.search(info):
+            return None
+        amount = int(match.group("amount"))
+        unit = match.group("unit").lower()
+        delta = timedelta(hours=amount) if unit.startswith("h") else timedelta(minutes=amount)
+        return info, (now + delta).replace(microsecond=0)
+
+    match = _CLOCK_RE.match(text)
+    if match is None or (match.group("day") and match.group("day_after")):
+        return None
+    info = match.group("info").strip()
+    if _AMBIGUOUS_TASK_RE.search(info):
+        return None
+    hour = int(match.group("hour"))
+    minute = int(match.group("minute") or 0)
+    if not 1 <= hour <= 12 or minute > 59:
+        return None
+    hour = hour % 12 + (12 if match.group("meridiem").lower() == "p" else 0)
+    day = (match.group("day") or match.group("day_after") or "").lower()
+    date = now.date() + timedelta(days=1) if day == "tomorrow" else now.date()
+    return info, now.replace(year=date.year, month=date.month, day=date.day, hour=hour, minute=minute, second=0, microsecond=0)
@@ -1,13 +1,25 @@
 """Text utility functions for handling text normalization and fragmentation detection."""
+import functools
+import re
 
 
+# One pass over the text covers every fragmentation signal:
+# - double spaces
+# - a space before ":" or "." (like "4 :00" or "a .m.")
+# - a standalone single letter other than "a"/"i" (any case); captured so it can be confirmed
+#   with str.isalpha(), since the class also admits numeric symbols like "½"
+_FRAGMENTATION_RE = re.compile(r"  | [:.]|(?<!\S)([^\W\d_aiAI])(?!\S)")
+
+
+@functools.lru_cache(maxsize=1024)
 def has_fragmentation(text):
     """Check if text has fragmentation patterns indicating incomplete audio transcription.
     
+    Results are memoized, since the same scratchpad lines are re-checked on every think() turn.
+    
     Fragmented transcriptions often have:
     - Double spaces
     - Single letter words (except common ones like "a", "i")
-    - Spaces within words (like "cre ate" instead of "create")
     - Spaces around punctuation (like "4 :00" or "a .m." instead of "4:00" or "a.m.")
     
     Args:
@@ -16,31 +28,20 @@ def has_fragmentation(text):
     Returns:
         bool: True if fragmentation patterns are detected
     """
-    words = text.split()
-    # Check for patterns that indicate fragmentation
-    has_double_spaces = "  " in text
-    has_spaces_in_words = any(" " in word for word in words)
-    
-    # Check for single letter words (excluding common ones like "a", "i", "I")
-    common_single_letters = {"a", "i", "A", "I"}
-    has_single_letter_words = any(
-        len(word) == 1 and word.isalpha() and word not in common_single_letters 
-        for word in words
-    )
-    
-    # Check for spaces around punctuation/numbers (like "4 :00", "a .m.", ":00 a .m.")
-    has_spaces_around_punctuation = (
-        " :" in text or  # Space before colon
-        " ." in text or  # Space before period
-        ": " in text and " :" in text  # Both patterns present
-    )
-    
-    return has_double_spaces or has_single_letter_words or has_spaces_in_words or has_spaces_around_punctuation
+    for match in _FRAGMENTATION_RE.finditer(text):
+        letter = match.group(1)
+        if letter is None or letter.isalpha():
+            return True
+    return False
 
 
+@functools.lru_cache(maxsize=1024)
 def normalize_text(text):
     """Normalize text for comparison by lowercasing and removing extra whitespace.
     
+    Results are memoized: the same scratchpad lines are normalized by duplicate detection,
+    chat history conversion and the tool agents on every think() turn.
+    
     Args:
         text: The text to normalize
         
@@ -49,10 +50,10 @@ def normalize_text(text):
     """
     if not text:
         return ""
-    return " ".join(text.lower().strip().split())
+    return " ".join(text.lower().split())
 
 
-def should_skip_fragmented_entry(entry_content, final_user_input):
+def should_skip_fragmented_entry(entry_content, final_normalized, final_has_fragmentation):
     """Determine if a scratchpad entry should be skipped because it's a fragmented transcription.
     
     Fragmented audio transcriptions should be skipped when we have a complete final user input
@@ -60,40 +61,37 @@ def should_skip_fragmented_entry(entry_content, final_user_input):
     
     Args:
         entry_content: The content from the scratchpad entry
-        final_user_input: The final, complete user input being processed
+        final_normalized: normalize_text() of the final, complete user input being processed
+        final_has_fragmentation: has_fragmentation() of the final user input
         
     Returns:
         bool: True if the entry should be skipped
     """
-    if not entry_content or not final_user_input:
+    if not entry_content or not final_normalized:
         return False
     
     # Normalize for comparison (lowercase, remove extra spaces)
     entry_normalized = normalize_text(entry_content)
-    final_normalized = normalize_text(final_user_input)
     
-    if not entry_normalized or not final_normalized:
+    if not entry_normalized:
         return False
     
-    # Check for fragmentation patterns
-    entry_has_fragmentation = has_fragmentation(entry_content)
-    final_has_fragmentation = has_fragmentation(final_user_input)
+    # Every skip rule below requires the entry to be fragmented, so run the cheap
+    # substring / length checks first and only scan for fragmentation when one holds.
+    length_ratio = len(entry_normalized) / len(final_normalized)
     
     # Skip if entry is a fragment that's a substring of the final user input
-    if entry_has_fragmentation and entry_normalized in final_normalized:
-        return True
+    if entry_normalized in final_normalized:
+        return has_fragmentation(entry_content)
     
     # Skip if entry is much shorter (clearly incomplete)
-    if entry_has_fragmentation and len(entry_normalized) < len(final_normalized) * 0.7:
-        return True
+    if length_ratio < 0.7:
+        return has_fragmentation(entry_content)
     
     # Skip if entry has fragmentation but final input is complete and they're similar in length
     # This catches cases where the fragment is mis-transcribed (like "ck my ra nge" vs "pack my rain jacket")
-    if entry_has_fragmentation and not final_has_fragmentation:
-        # If lengths are similar (within 30%), likely the same request with different transcription quality
-        length_ratio = len(entry_normalized) / len(final_normalized) if final_normalized else 0
-        if 0.7 <= length_ratio <= 1.3:
-            # Similar length, but entry is fragmented and final is complete - skip the fragment
-            return True
+    # (lengths within 30% are likely the same request with different transcription quality)
+    if not final_has_fragmentation and length_ratio <= 1.3:
+        return has_fragmentation(entry_content)
     
     return False
@@ -1,10 +1,29 @@
 import os
+import threading
+import time
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Connections are kept open and reused by execute_query / execute_update / execute_values_update
+# instead of connecting (and authenticating) to Postgres on every query
+DB_POOL_MIN_CONN = int(os.environ.get("DB_POOL_MIN_CONN", "1"))
+DB_POOL_MAX_CONN = int(os.environ.get("DB_POOL_MAX_CONN", "10"))
+_pool = None
+_pool_lock = threading.Lock()
+# ThreadedConnectionPool raises instead of waiting when every connection is in use, so callers
+# queue here for a free slot
+_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX_CONN)
+# Connections idle in the pool for longer than this are checked with SELECT 1 before reuse, so one
+# dropped by Postgres or a proxy is replaced instead of failing the caller's query
+DB_POOL_PING_AFTER_SECONDS = float(os.environ.get("DB_POOL_PING_AFTER_SECONDS", "30"))
+# id(conn) -> time.monotonic() when it was last returned to the pool
+_released_at = {}
+
 def get_db_connection():
     """Get a connection to the PostgreSQL database from environment variables."""
     try:
@@ -20,6 +39,81 @@ def get_db_connection():
         print(f"Error connecting to database: {e}")
         raise
 
+def _get_pool():
+    """Create the shared connection pool on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    DB_POOL_MIN_CONN,
+                    DB_POOL_MAX_CONN,
+                    host=os.environ["DB_HOST"],
+                    port=os.environ.get("DB_PORT", "5432"),
+                    database=os.environ["DB_NAME"],
+                    user=os.environ["DB_USER"],
+                    password=os.environ["DB_PASSWORD"]
+                )
+    return _pool
+
+def get_pooled_connection():
+    """
+    Borrow a connection from the shared pool, waiting for one if all are in use.
+    
+    Every connection must be handed back with release_pooled_connection().
+    """
+    _pool_slots.acquire()
+    try:
+        pool = _get_pool()
+        # Every pooled connection may be stale; after that getconn() opens a fresh one
+        for _ in range(DB_POOL_MAX_CONN + 1):
+            conn = pool.getconn()
+            if _is_usable(conn):
+                return conn
+            pool.putconn(conn, close=True)
+        return pool.getconn()
+    except psycopg2.Error as e:
+        _pool_slots.release()
+        print(f"Error connecting to database: {e}")
+        raise
+    except Exception:
+        _pool_slots.release()
+        raise
+
+def _is_usable(conn):
+    """Whether a connection from the pool is still open, pinging it if it sat idle for a while."""
+    released_at = _released_at.pop(id(conn), None)
+    if conn.closed:
+        return False
+    # Connections never seen here (e.g. opened when the pool was created) are pinged once too
+    if released_at is not None and time.monotonic() - released_at < DB_POOL_PING_AFTER_SECONDS:
+        return True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+def release_pooled_connection(conn):
+    """Return a borrowed connection to the pool, ending any open transaction or discarding it if broken."""
+    try:
+        broken = bool(conn.closed)
+        if not broken and conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                broken = True
+        if not broken:
+            _released_at[id(conn)] = time.monotonic()
+        _get_pool().putconn(conn, close=broken)
+        # The pool closes connections beyond DB_POOL_MIN_CONN instead of keeping them
+        if conn.closed:
+            _released_at.pop(id(conn), None)
+    finally:
+        _pool_slots.release()
+
 def execute_query(query, params=None):
     """
     Execute a SELECT query and return the results as a list of dictionaries.
@@ -33,7 +127,7 @@ def execute_query(query, params=None):
     """
     conn = None
     try:
-        conn = get_db_connection()
+        conn = get_pooled_connection()
         print(f"Connected to database: {conn}")
 
         cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -59,7 +153,7 @@ def execute_query(query, params=None):
         if conn:
             if 'cursor' in locals():
                 cursor.close()
-            conn.close()
+            release_pooled_connection(conn)
 
 def execute_update(query, params=None):
     """
@@ -74,7 +168,7 @@ def execute_update(query, params=None):
     """
     conn = None
     try:
-        conn = get_db_connection()
+        conn = get_pooled_connection()
         cursor = conn.cursor()
         
         if params:
@@ -95,8 +189,44 @@ def execute_update(query, params=None):
         if conn:
             if 'cursor' in locals():
                 cursor.close()
-            conn.close()
+            release_pooled_connection(conn)
+
 
+def execute_values_update(query, rows, page_size=100):
+    """
+    Execute an INSERT (or other multi-row statement) for many rows in one round-trip and commit.
+    
+    Args:
+        query: SQL query string with a single %s placeholder for the VALUES list
+        rows: List of parameter tuples, one per row
+        page_size: Maximum number of rows sent per statement
+        
+    Returns:
+        Number of rows affected
+    """
+    conn = None
+    try:
+        conn = get_pooled_connection()
+        cursor = conn.cursor()
+        
+        # execute_values only reports the rowcount of its last page, so page here and sum them
+        rows_affected = 0
+        for start in range(0, len(rows), page_size):
+            execute_values(cursor, query, rows[start:start + page_size], page_size=page_size)
+            rows_affected += cursor.rowcount
+        conn.commit()
+        return rows_affected
+    
+    except psycopg2.Error as e:
+        if conn:
+            conn.rollback()
+        print(f"Error executing batch update: {e}")
+        raise
+    finally:
+        if conn:
+            if 'cursor' in locals():
+                cursor.close()
+            release_pooled_connection(conn)
 
 def get_user_timezone(user_id: str) -> str:
     """
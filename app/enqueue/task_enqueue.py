@@ -5,7 +5,7 @@ Handles enqueueing tasks to Azure Service Bus.
 import os
 import json
 from datetime import datetime, UTC
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 
 # Load environment variables from .env file (for local development)
@@ -100,6 +100,32 @@ def prepare_message_contents(
     return message_contents
 
 
+def parse_scheduled_time(time_to_execute: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 time_to_execute into a UTC datetime for scheduled delivery.
+    
+    Args:
+        time_to_execute: Optional ISO 8601 datetime string
+        
+    Returns:
+        Timezone-aware UTC datetime, or None if time_to_execute is empty (send immediately)
+        
+    Raises:
+        ValueError: If time_to_execute is not valid ISO 8601
+    """
+    if not time_to_execute:
+        return None
+    try:
+        # Parse ISO 8601 datetime string (Python 3.11+ accepts a trailing "Z")
+        scheduled_time = datetime.fromisoformat(time_to_execute)
+    except ValueError as e:
+        raise ValueError(f"Invalid time_to_execute format: {e}. Expected ISO 8601 format.")
+    # Ensure it's timezone-aware (UTC)
+    if scheduled_time.tzinfo is None:
+        return scheduled_time.replace(tzinfo=UTC)
+    return scheduled_time.astimezone(UTC)
+
+
 def enqueue_task(
     task_id: str,
     user_id: str,
@@ -132,18 +158,7 @@ def enqueue_task(
         message_content = json.dumps(message_contents)
         
         # Determine scheduled time
-        scheduled_time = None
-        if time_to_execute:
-            try:
-                # Parse ISO 8601 datetime string
-                scheduled_time = datetime.fromisoformat(time_to_execute.replace('Z', '+00:00'))
-                # Ensure it's timezone-aware (UTC)
-                if scheduled_time.tzinfo is None:
-                    scheduled_time = scheduled_time.replace(tzinfo=UTC)
-                else:
-                    scheduled_time = scheduled_time.astimezone(UTC)
-            except ValueError as e:
-                raise ValueError(f"Invalid time_to_execute format: {e}. Expected ISO 8601 format.")
+        scheduled_time = parse_scheduled_time(time_to_execute)
         
         # Get Service Bus client and enqueue
         with get_service_bus_client() as client:
@@ -180,6 +195,141 @@ def enqueue_task(
         raise
 
 
+def _failed_result(task_id: str, error: Exception) -> Dict[str, Any]:
+    """Enqueue result for a task that was not sent to Service Bus."""
+    return {
+        "success": False,
+        "task_id": task_id,
+        "scheduled_time": None,
+        "message": f"Failed to enqueue task: {error}",
+        "sequence_id": None,
+        "error": str(error),
+    }
+
+
+def enqueue_tasks(
+    tasks: List[Dict[str, Any]],
+    queue_name: str = "q1"
+) -> List[Dict[str, Any]]:
+    """
+    Enqueue several tasks to Azure Service Bus over a single client and sender.
+    
+    Immediate tasks are sent together in one ServiceBusMessageBatch (more than one if they exceed
+    the batch size limit); scheduled tasks are scheduled with one call per distinct scheduled time.
+    
+    Each task succeeds or fails on its own: a failed schedule call or batch send only marks the
+    tasks it carried as failed, so callers still get the sequence ids of everything that was sent.
+    
+    Args:
+        tasks: List of dicts with task_id, user_id and optional task_info / time_to_execute,
+            the same fields enqueue_task takes
+        queue_name: Name of the Service Bus queue (default: "q1")
+        
+    Returns:
+        List of enqueue result dicts (same shape as enqueue_task's), in input order. Tasks that
+        were not sent have "success": False and an "error" message.
+        
+    Raises:
+        ValueError: If Service Bus is not configured or the connection fails (nothing was sent)
+    """
+    if not tasks:
+        return []
+    print(f"Enqueueing {len(tasks)} task(s) to queue {queue_name}")
+    results = [None] * len(tasks)
+    messages = [None] * len(tasks)
+    scheduled_groups = {}
+    immediate = []
+    for idx, task in enumerate(tasks):
+        try:
+            message_contents = prepare_message_contents(task["task_id"], task["user_id"], task.get("task_info"))
+            messages[idx] = json.dumps(message_contents)
+            scheduled_time = parse_scheduled_time(task.get("time_to_execute"))
+        except Exception as e:
+            print(f"Error enqueueing task {task['task_id']}: {e}")
+            results[idx] = _failed_result(task["task_id"], e)
+            continue
+        if scheduled_time:
+            scheduled_groups.setdefault(scheduled_time, []).append(idx)
+        else:
+            immediate.append(idx)
+    
+    try:
+        with get_service_bus_client() as client:
+            with client.get_queue_sender(queue_name) as sender:
+                for scheduled_time, indexes in scheduled_groups.items():
+                    try:
+                        # schedule_messages returns one sequence number per message, in order
+                        sequence_numbers = sender.schedule_messages(
+                            [ServiceBusMessage(messages[idx]) for idx in indexes], scheduled_time
+                        ) or []
+                    except Exception as e:
+                        print(f"Error scheduling {len(indexes)} task(s) for {scheduled_time.isoformat()}: {e}")
+                        for idx in indexes:
+                            results[idx] = _failed_result(tasks[idx]["task_id"], e)
+                        continue
+                    scheduled_str = scheduled_time.strftime('%Y-%m-%d %H:%M:%S UTC')
+                    for position, idx in enumerate(indexes):
+                        sequence_id = sequence_numbers[position] if position < len(sequence_numbers) else None
+                        results[idx] = {
+                            "success": True,
+                            "task_id": tasks[idx]["task_id"],
+                            "scheduled_time": scheduled_time.isoformat(),
+                            "message": f"Task scheduled for {scheduled_str}",
+                            "sequence_id": sequence_id,
+                        }
+                
+                if immediate:
+                    _send_immediate(sender, tasks, messages, immediate, results)
+    except Exception as e:
+        # Nothing was sent if the client or sender could not be opened
+        if all(result is None or not result["success"] for result in results):
+            print(f"Error enqueueing tasks: {e}")
+            raise
+        print(f"Error enqueueing tasks after some were sent: {e}")
+        for idx, result in enumerate(results):
+            if result is None:
+                results[idx] = _failed_result(tasks[idx]["task_id"], e)
+    
+    sent = sum(1 for result in results if result["success"])
+    print(f"✅ Enqueued {sent} of {len(tasks)} task(s) ({len(immediate)} immediate, {len(tasks) - len(immediate)} scheduled)")
+    return results
+
+
+def _send_immediate(sender, tasks, messages, indexes, results):
+    """Send immediate messages in as few batches as fit, recording each batch's outcome in results."""
+    def send(batch, batch_indexes):
+        try:
+            sender.send_messages(batch)
+        except Exception as e:
+            print(f"Error sending {len(batch_indexes)} immediate task(s): {e}")
+            for idx in batch_indexes:
+                results[idx] = _failed_result(tasks[idx]["task_id"], e)
+            return
+        for idx in batch_indexes:
+            results[idx] = {
+                "success": True,
+                "task_id": tasks[idx]["task_id"],
+                "scheduled_time": None,
+                "message": "Task enqueued immediately",
+                "sequence_id": None,
+            }
+    
+    batch = sender.create_message_batch()
+    batch_indexes = []
+    for idx in indexes:
+        message = ServiceBusMessage(messages[idx])
+        try:
+            batch.add_message(message)
+        except ValueError:
+            # Batch is full: send it and start a new one
+            send(batch, batch_indexes)
+            batch = sender.create_message_batch()
+            batch_indexes = []
+            batch.add_message(message)
+        batch_indexes.append(idx)
+    send(batch, batch_indexes)
+
+
 def enqueue_task_safe(
     task_id: str,
     user_id: str,
@@ -0,0 +1,55 @@
+"""
+Background Service Bus work for tasks.
+Runs enqueue / cancel / re-enqueue calls off the request path, in submission order per task,
+so an edit's cancel or re-enqueue never runs before the create that scheduled the message
+(and wrote its enqueue_sequence_id).
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="task-service-bus")
+
+# Most recently submitted work per task_id, until it finishes
+_pending: Dict[str, Future] = {}
+_pending_lock = threading.Lock()
+
+
+def _run_after(previous: List[Future], fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+    # previous was submitted earlier, so it is already running or done and this wait cannot deadlock
+    wait(previous)
+    return fn(*args, **kwargs)
+
+
+def _forget(task_ids: List[str], future: Future) -> None:
+    with _pending_lock:
+        for task_id in task_ids:
+            if _pending.get(task_id) is future:
+                del _pending[task_id]
+
+
+def submit_task_work(task_ids: Iterable[str], fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """
+    Run fn(*args, **kwargs) in the background after any earlier work submitted for the same tasks.
+
+    Work for different tasks still runs concurrently.
+
+    Args:
+        task_ids: IDs of the tasks fn touches
+        fn: The Service Bus call to run
+
+    Returns:
+        Future for fn's result
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    with _pending_lock:
+        previous = []
+        for task_id in task_ids:
+            pending = _pending.get(task_id)
+            if pending is not None and pending not in previous:
+                previous.append(pending)
+        future = _EXECUTOR.submit(_run_after, previous, fn, args, kwargs)
+        for task_id in task_ids:
+            _pending[task_id] = future
+    future.add_done_callback(lambda done: _forget(task_ids, done))
+    return future
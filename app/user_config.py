@@ -1,4 +1,4 @@
-from typing import Optional, TypedDict
+from typing import NotRequired, Optional, TypedDict
 
 
 class UserConfigData(TypedDict):
@@ -8,3 +8,4 @@ class UserConfigData(TypedDict):
     current_time_str: str
     current_date_str: str
     timezone: str
+    chat_history_window: NotRequired[int]
@@ -24,8 +24,9 @@ from routes.task_crud import get_task_by_id
 from audio_manager import AudioManager
 from transcription_handler import TranscriptionHandler
 
-# Instantiate the general thinking agent
-generalThinkingAgent = general_thinking_agent.GeneralThinkingAgent()
+# Instantiate the general thinking agent. The user is waiting on a live voice session, so overlap
+# the final response with the last tool-selection call when it is likely to be needed.
+generalThinkingAgent = general_thinking_agent.GeneralThinkingAgent(speculative_generate_response=True)
 
 
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
@@ -36,7 +37,7 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
         """Lowercase and collapse whitespace for stable comparisons."""
         if not isinstance(text, str):
             return ""
-        return " ".join(text.lower().strip().split())
+        return " ".join(text.lower().split())
 
     # Track user inputs that have already been processed by the think tool to avoid loops
     processed_tool_inputs = set()
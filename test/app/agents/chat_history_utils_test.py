@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+
+# Add the app directory to the Python path to enable imports like "from database import ..."
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+sys.path.insert(0, os.path.join(project_root, 'app'))
+sys.path.insert(0, project_root)
+
+from app.agents.utils.chat_history_utils import summarize_chat_history, window_chat_history
+
+
+def user(content):
+    return {"role": "user", "content": content}
+
+
+def assistant(content, name=None):
+    message = {"role": "assistant", "content": content}
+    if name:
+        message["name"] = name
+    return message
+
+
+class ChatHistoryUtilsTest(unittest.TestCase):
+
+    def test_short_history_is_returned_unchanged(self):
+        """Test that a history within the window is passed through as-is."""
+        chat_history = [user("hi"), assistant("hello")]
+        self.assertIs(window_chat_history(chat_history, max_messages=5), chat_history)
+
+    def test_keeps_trailing_messages(self):
+        """Test that only the last max_messages messages are kept."""
+        chat_history = [user(f"message {i}") if i % 2 == 0 else assistant(f"reply {i}") for i in range(10)]
+        self.assertEqual(window_chat_history(chat_history, max_messages=3), chat_history[-3:])
+
+    def test_keeps_whole_current_turn(self):
+        """Test that the window is extended back to the most recent user message."""
+        chat_history = [user("old"), assistant("old reply"), user("create three tasks")]
+        chat_history += [assistant('{"success": true}', name="create_tasks_tool") for _ in range(4)]
+        self.assertEqual(window_chat_history(chat_history, max_messages=2), chat_history[2:])
+
+    def test_pins_latest_tool_output_outside_window(self):
+        """Test that the most recent pinned tool output is kept once it scrolls out of the window."""
+        old_tasks = assistant('{"tasks": [], "total_count": 0}', name="get_tasks_tool")
+        new_tasks = assistant('{"tasks": [{"task_id": "1"}], "total_count": 1}', name="get_tasks_tool")
+        chat_history = [user("what do I have"), old_tasks, new_tasks, assistant("You have one task"),
+                        user("thanks"), assistant("You're welcome"), user("mark it done")]
+
+        windowed = window_chat_history(chat_history, max_messages=3)
+
+        self.assertEqual(windowed, [new_tasks] + chat_history[-3:])
+
+    def test_summary_lists_recent_messages_compactly(self):
+        """Test that the summary has one truncated "role (name): content" line per recent message."""
+        chat_history = [user("old request"), assistant("x" * 50, name="get_tasks_tool"), user("delete my walk task")]
+
+        summary = summarize_chat_history(chat_history, max_messages=2, max_chars=10)
+
+        self.assertEqual(summary, "assistant (get_tasks_tool): xxxxxxxxxx…\nuser: delete my walk task")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,13 +12,15 @@ sys.path.insert(0, os.path.join(project_root, 'app'))
 sys.path.insert(0, project_root)
 sys.path.insert(0, test_dir)
 
-from app.agents.tool_agents.create_tasks_tool_agent import CreateTasksToolAgent
+from app.agents.tool_agents.create_tasks_tool_agent import CreateTasksToolAgent, _enqueue_created_tasks
 # Import test helpers - works for both direct execution and unittest
 try:
     # Try relative import first (works when run as module)
     from .test_helpers import (
         are_openai_credentials_configured,
-        create_enqueue_side_effect,
+        create_enqueue_tasks_side_effect,
+        create_mock_enqueue_result,
+        run_task_work_inline,
         create_chat_history_with_date
     )
 except ImportError:
@@ -29,7 +31,9 @@ except ImportError:
     test_helpers = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(test_helpers)
     are_openai_credentials_configured = test_helpers.are_openai_credentials_configured
-    create_enqueue_side_effect = test_helpers.create_enqueue_side_effect
+    create_enqueue_tasks_side_effect = test_helpers.create_enqueue_tasks_side_effect
+    create_mock_enqueue_result = test_helpers.create_mock_enqueue_result
+    run_task_work_inline = test_helpers.run_task_work_inline
     create_chat_history_with_date = test_helpers.create_chat_history_with_date
 
 
@@ -47,15 +51,16 @@ class CreateTasksToolAgentTest(unittest.TestCase):
         """Clean up after each test."""
         pass
     
-    @patch('app.agents.tool_agents.create_tasks_tool_agent.enqueue_task')
-    @patch('app.agents.tool_agents.create_tasks_tool_agent.execute_update')
-    def test_create_task_with_enqueue(self, mock_execute_update, mock_enqueue_task):
+    @patch('app.agents.tool_agents.create_tasks_tool_agent.submit_task_work', side_effect=run_task_work_inline)
+    @patch('app.agents.tool_agents.create_tasks_tool_agent.enqueue_tasks')
+    @patch('app.agents.tool_agents.create_tasks_tool_agent.execute_values_update')
+    def test_create_task_with_enqueue(self, mock_execute_update, mock_enqueue_tasks, _):
         """Test that create_tasks_tool_agent creates a task and enqueues it properly."""
-        # Setup mock for execute_update (database insert)
+        # Setup mock for execute_values_update (database insert)
         mock_execute_update.return_value = 1  # 1 row affected
         
-        # Setup mock for enqueue_task (Service Bus)
-        mock_enqueue_task.side_effect = create_enqueue_side_effect()
+        # Setup mock for enqueue_tasks (Service Bus)
+        mock_enqueue_tasks.side_effect = create_enqueue_tasks_side_effect()
         
         # Prepare chat history with a task creation request including today's date
         chat_history = create_chat_history_with_date("Create a task to buy groceries tomorrow at 2pm")
@@ -72,11 +77,12 @@ class CreateTasksToolAgentTest(unittest.TestCase):
         self.assertIn("task_id", result_data, "Result should contain task_id")
         self.assertIn("task_info", result_data, "Result should contain task_info")
         self.assertIn("time_to_execute", result_data, "Result should contain time_to_execute")
+        self.assertNotIn("{'info'", result_data["message"], "Message should name the task by its text")
         
         task_id = result_data["task_id"]
         
-        # Verify execute_update was called (database insert)
-        self.assertTrue(mock_execute_update.called, "execute_update should be called to insert task")
+        # Verify execute_values_update was called (database insert)
+        self.assertTrue(mock_execute_update.called, "execute_values_update should be called to insert task")
         call_args = mock_execute_update.call_args
         self.assertIn("INSERT INTO tasks", call_args[0][0], "Should insert into tasks table")
         
@@ -99,30 +105,21 @@ class CreateTasksToolAgentTest(unittest.TestCase):
             self.assertLess(time_diff, 86400, "Time to execute should be approximately tomorrow")
         
         # Verify enqueue was called
-        self.assertTrue(mock_enqueue_task.called, "enqueue_task should be called")
-        enqueue_call_args = mock_enqueue_task.call_args
-        self.assertEqual(enqueue_call_args[1]["task_id"], task_id, "Enqueue should be called with correct task_id")
-        
-        # Verify enqueue result is present
-        if "enqueue_result" in result_data:
-            enqueue_result = result_data["enqueue_result"]
-            self.assertTrue(enqueue_result.get("success"), "Enqueue should succeed")
-            self.assertEqual(enqueue_result.get("task_id"), task_id, "Enqueued task ID should match")
-            self.assertIn("scheduled_time", enqueue_result, "Scheduled time should be present")
-            print(f"✅ Task successfully enqueued: {enqueue_result}")
-        else:
-            print("⚠️  Enqueue result not present (Service Bus may not be configured or enqueue failed)")
+        self.assertTrue(mock_enqueue_tasks.called, "enqueue_tasks should be called")
+        enqueued_tasks = mock_enqueue_tasks.call_args[0][0]
+        self.assertEqual(enqueued_tasks[0]["task_id"], task_id, "Enqueue should be called with correct task_id")
 
-    @patch('app.agents.tool_agents.create_tasks_tool_agent.enqueue_task')
-    @patch('app.agents.tool_agents.create_tasks_tool_agent.execute_update')
-    def test_create_exactly_one_task(self, mock_execute_update, mock_enqueue_task):
+    @patch('app.agents.tool_agents.create_tasks_tool_agent.submit_task_work', side_effect=run_task_work_inline)
+    @patch('app.agents.tool_agents.create_tasks_tool_agent.enqueue_tasks')
+    @patch('app.agents.tool_agents.create_tasks_tool_agent.execute_values_update')
+    def test_create_exactly_one_task(self, mock_execute_update, mock_enqueue_tasks, _):
         """Test that when user asks to create a task, exactly 1 task is created (not less or more)."""
-        # Setup mock for execute_update (database insert)
+        # Setup mock for execute_values_update (database insert)
         # Track how many times it's called
         mock_execute_update.return_value = 1  # 1 row affected
         
-        # Setup mock for enqueue_task (Service Bus)
-        mock_enqueue_task.side_effect = create_enqueue_side_effect()
+        # Setup mock for enqueue_tasks (Service Bus)
+        mock_enqueue_tasks.side_effect = create_enqueue_tasks_side_effect()
         
         # Prepare chat history with a task creation request
         chat_history = create_chat_history_with_date("Create a task to call mom tomorrow at 3pm")
@@ -140,27 +137,50 @@ class CreateTasksToolAgentTest(unittest.TestCase):
         
         task_id = result_data["task_id"]
         
-        # Verify execute_update was called exactly once
+        # Verify execute_values_update was called exactly once, with exactly one row
         self.assertEqual(mock_execute_update.call_count, 1, 
-                        f"execute_update should be called exactly once. Called {mock_execute_update.call_count} time(s).")
+                        f"execute_values_update should be called exactly once. Called {mock_execute_update.call_count} time(s).")
+        self.assertEqual(len(mock_execute_update.call_args[0][1]), 1, "Exactly one row should be inserted")
         
         # Verify the call was for an INSERT
         call_args = mock_execute_update.call_args
         self.assertIn("INSERT INTO tasks", call_args[0][0], "Should insert into tasks table")
         
         # Verify that exactly 1 task creation was attempted
-        # Since we're mocking, we verify by checking the number of calls to execute_update
+        # Since we're mocking, we verify by checking the number of calls to execute_values_update
         tasks_created = mock_execute_update.call_count
         self.assertEqual(tasks_created, 1, 
                         f"Exactly 1 task should be created. Expected 1, but {tasks_created} task(s) were created.")
         
-        # Verify enqueue was called exactly once
-        self.assertEqual(mock_enqueue_task.call_count, 1,
-                        f"enqueue_task should be called exactly once. Called {mock_enqueue_task.call_count} time(s).")
+        # Verify enqueue was called exactly once, for exactly one task
+        self.assertEqual(mock_enqueue_tasks.call_count, 1,
+                        f"enqueue_tasks should be called exactly once. Called {mock_enqueue_tasks.call_count} time(s).")
+        enqueued_tasks = mock_enqueue_tasks.call_args[0][0]
+        self.assertEqual(len(enqueued_tasks), 1, "Exactly one task should be enqueued")
         
         # Verify the task_id in the enqueue call matches
-        enqueue_call_args = mock_enqueue_task.call_args
-        self.assertEqual(enqueue_call_args[1]["task_id"], task_id, "Enqueue should be called with correct task_id")
+        self.assertEqual(enqueued_tasks[0]["task_id"], task_id, "Enqueue should be called with correct task_id")
+
+
+class EnqueueCreatedTasksTest(unittest.TestCase):
+
+    @patch('app.agents.tool_agents.create_tasks_tool_agent.update_task_enqueue_sequence_id')
+    @patch('app.agents.tool_agents.create_tasks_tool_agent.enqueue_tasks')
+    def test_sequence_ids_saved_for_tasks_that_were_sent(self, mock_enqueue_tasks, mock_update_sequence_id):
+        """Test that a partial Service Bus failure still persists the sequence ids of the sent tasks."""
+        time_to_execute = datetime.now(timezone.utc) + timedelta(days=1)
+        tasks = [
+            {"task_id": task_id, "user_id": "user-1", "task_info": {"info": task_id}, "time_to_execute": time_to_execute}
+            for task_id in ("task-1", "task-2")
+        ]
+        mock_enqueue_tasks.return_value = [
+            create_mock_enqueue_result(task_id="task-1", sequence_id=101),
+            create_mock_enqueue_result(task_id="task-2", success=False, sequence_id=None),
+        ]
+
+        _enqueue_created_tasks(tasks)
+
+        mock_update_sequence_id.assert_called_once_with("task-1", 101)
 
 
 if __name__ == '__main__':
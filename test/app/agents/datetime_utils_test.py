@@ -0,0 +1,36 @@
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+# Add the app directory to the Python path to enable imports like "from database import ..."
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+sys.path.insert(0, os.path.join(project_root, 'app'))
+sys.path.insert(0, project_root)
+
+from app.agents.utils.datetime_utils import get_zoneinfo, parse_iso_datetime
+
+
+class DatetimeUtilsTest(unittest.TestCase):
+
+    def test_parse_iso_datetime_accepts_z_and_offsets(self):
+        """Test that "Z", explicit offsets and naive times parse like fromisoformat."""
+        self.assertEqual(parse_iso_datetime("2026-01-17T16:00:00Z"), datetime(2026, 1, 17, 16, tzinfo=timezone.utc))
+        self.assertEqual(
+            parse_iso_datetime("2026-01-17T16:00:00-08:00"),
+            datetime(2026, 1, 17, 16, tzinfo=timezone(timedelta(hours=-8))),
+        )
+        self.assertIsNone(parse_iso_datetime("2026-01-17T16:00:00").tzinfo)
+
+    def test_parse_iso_datetime_rejects_invalid_strings(self):
+        """Test that a non-ISO string raises ValueError."""
+        with self.assertRaises(ValueError):
+            parse_iso_datetime("tomorrow at 4pm")
+
+    def test_get_zoneinfo_reuses_instances(self):
+        """Test that the same timezone name returns the same ZoneInfo object."""
+        self.assertIs(get_zoneinfo("America/Los_Angeles"), get_zoneinfo("America/Los_Angeles"))
+
+
+if __name__ == '__main__':
+    unittest.main()
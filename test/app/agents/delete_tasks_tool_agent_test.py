@@ -123,16 +123,15 @@ class DeleteTasksToolAgentTest(unittest.TestCase):
             )]
         )
         
-        # Mock database query - called 2 times:
-        # 1. Fetch current state for available_tasks (line 52)
-        # 2. Verify task exists before deletion (line 214)
+        # Mock database query - called once: the batched fetch of current state for
+        # available_tasks also supplies the row verified before deletion
         original_task = create_mock_task(
             task_id=task_id,
             task_info=task_info,
             status="pending",
             time_to_execute=original_time
         )
-        mock_execute_query.side_effect = [[original_task], [original_task]]
+        mock_execute_query.side_effect = [[original_task]]
         
         # Mock database update (DELETE)
         mock_execute_update.return_value = 1  # 1 row affected
@@ -169,6 +168,7 @@ class DeleteTasksToolAgentTest(unittest.TestCase):
         self.assertIn("DELETE FROM TASKS", query_normalized, "Should delete from tasks table")
         self.assertEqual(params[0], task_id, "First param should be task_id")
         self.assertEqual(params[1], DEFAULT_USER_ID, "Second param should be user_id")
+        self.assertEqual(mock_execute_query.call_count, 1, "Task state should be fetched in one query")
     
     @patch('app.agents.tool_agents.delete_tasks_tool_agent.execute_query')
     @patch('app.agents.tool_agents.delete_tasks_tool_agent.gemini_response_to_openai_like')
@@ -270,7 +270,7 @@ class DeleteTasksToolAgentTest(unittest.TestCase):
     @patch('app.agents.tool_agents.delete_tasks_tool_agent.call_gemini')
     def test_delete_task_fails_when_task_belongs_to_different_user(self, mock_call_gemini, mock_gemini_response_to_openai_like, mock_execute_update, mock_execute_query):
         """Test that delete_tasks_tool_agent returns an error when task belongs to a different user."""
-        task_id = "other-user-task"
+        task_id = "3f2b8c4e-5d6a-4e7f-9a1b-2c3d4e5f6a7b"
         other_user_id = "different-user-id"
         task_info = {"info": "Some task"}
         
@@ -297,7 +297,7 @@ class DeleteTasksToolAgentTest(unittest.TestCase):
             task_info=task_info,
             status="pending"
         )
-        mock_execute_query.side_effect = [[other_user_task], [other_user_task]]  # Available tasks, then verify exists
+        mock_execute_query.side_effect = [[], [other_user_task]]  # Not among the user's tasks, then verify exists
         
         # Create chat history with task
         chat_history = self.create_chat_history_with_task(
@@ -320,6 +320,10 @@ class DeleteTasksToolAgentTest(unittest.TestCase):
             "does not belong" in message or "belong to" in message,
             f"Error message should indicate ownership issue. Got: {message}"
         )
+        # The batched refresh compares task_id as a uuid so the primary key index is used
+        refresh_query, refresh_params = mock_execute_query.call_args_list[0][0]
+        self.assertIn("task_id = ANY(%s::uuid[])", refresh_query)
+        self.assertEqual(refresh_params, ([task_id], self.user_config["user_info"]["user_id"]))
     
     @patch('app.agents.tool_agents.delete_tasks_tool_agent.execute_query')
     @patch('app.agents.tool_agents.delete_tasks_tool_agent.execute_update')
@@ -351,7 +355,7 @@ class DeleteTasksToolAgentTest(unittest.TestCase):
             )]
         )
         
-        # Mock database query - called for each task in available_tasks, then verify exists
+        # Mock database query - one batched fetch for all tasks in available_tasks
         original_task_1 = create_mock_task(
             task_id=task_id_1,
             task_info=task_info_1,
@@ -365,7 +369,7 @@ class DeleteTasksToolAgentTest(unittest.TestCase):
             time_to_execute=original_time + timedelta(hours=2)
         )
         # Calls: fetch current state for both tasks, verify task_1 exists
-        mock_execute_query.side_effect = [[original_task_1], [original_task_2], [original_task_1]]
+        mock_execute_query.side_effect = [[original_task_1, original_task_2]]
         
         # Mock database update
         mock_execute_update.return_value = 1  # 1 row affected
@@ -456,7 +460,7 @@ class DeleteTasksToolAgentTest(unittest.TestCase):
             time_to_execute=time_9am
         )
         # Calls: fetch current state for both tasks, verify task_1 exists
-        mock_execute_query.side_effect = [[original_task_1], [original_task_2], [original_task_1]]
+        mock_execute_query.side_effect = [[original_task_1, original_task_2]]
         
         # Mock database update
         mock_execute_update.return_value = 1  # 1 row affected
@@ -524,9 +528,8 @@ class DeleteTasksToolAgentTest(unittest.TestCase):
             )]
         )
         
-        # Mock database query - called multiple times:
-        # 1. Fetch current state for available_tasks - called for each task (2 tasks here)
-        # 2. Verify task exists before deletion
+        # Mock database query - called once: the batched fetch of current state for both
+        # available_tasks also supplies the row verified before deletion
         original_other_task = create_mock_task(
             task_id=other_task_id,
             task_info=other_task_info,
@@ -540,7 +543,7 @@ class DeleteTasksToolAgentTest(unittest.TestCase):
             time_to_execute=original_time
         )
         # All calls: fetch current state for both tasks, verify reminder task exists
-        mock_execute_query.side_effect = [[original_other_task], [original_reminder_task], [original_reminder_task]]
+        mock_execute_query.side_effect = [[original_other_task, original_reminder_task]]
         
         # Mock database update
         mock_execute_update.return_value = 1  # 1 row affected
@@ -2,6 +2,7 @@ import unittest
 import sys
 import os
 import json
+import threading
 from unittest.mock import Mock, patch
 from types import SimpleNamespace
 
@@ -523,7 +524,180 @@ class GeneralThinkingAgentTest(unittest.TestCase):
         # Verify select_tool was called twice (first with 2 tool calls, second for generate_response)
         self.assertEqual(mock_select_tool_agent.select_tool.call_count, 2,
                         "select_tool should be called twice")
+
+    @patch('app.agents.general_thinking_agent.SelectToolAgent')
+    def test_parallel_safe_tool_calls_run_concurrently(self, mock_select_tool_agent_class):
+        """Test that independent tool calls in a single response overlap and keep their emitted order."""
+        mock_select_tool_agent = Mock()
+        mock_select_tool_agent_class.return_value = mock_select_tool_agent
+        
+        mock_select_tool_agent.select_tool.side_effect = [
+            create_mock_tool_call_response(["get_tasks_tool", "send_message_tool"]),
+            create_mock_tool_call_response("generate_response_tool")
+        ]
+        
+        mock_agents = self._setup_mock_tool_agents()
+        # Each tool waits for the other one to start; this only completes if both run at once
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def wait_then_respond(tool_name):
+            def _execute(chat_history, user_config):
+                barrier.wait()
+                return create_mock_tool_response(tool_name)
+            return _execute
+        
+        mock_agents["get_tasks_tool"].execute_tool.side_effect = wait_then_respond("get_tasks_tool")
+        mock_agents["send_message_tool"].execute_tool.side_effect = wait_then_respond("send_message_tool")
+        mock_agents["get_tasks_tool"].parallel_safe = True
+        mock_agents["send_message_tool"].parallel_safe = True
+        self.agent.tool_agents = mock_agents
+        
+        result = self.agent.think("What are my tasks? Also text my mom that I'm on my way", None)
+        
+        self.assertEqual(mock_agents["get_tasks_tool"].execute_tool.call_count, 1)
+        self.assertEqual(mock_agents["send_message_tool"].execute_tool.call_count, 1)
+        self.assertEqual(mock_agents["generate_response_tool"].execute_tool.call_count, 1)
+        
+        # Tool results are appended in the order the model emitted them
+        tool_turns = [m["name"] for m in result["chat_history"] if m.get("role") == "assistant"]
+        self.assertEqual(tool_turns, ["get_tasks_tool", "send_message_tool"])
+        
+    @patch('app.agents.general_thinking_agent.SelectToolAgent')
+    def test_tool_limit_skips_extra_select_call(self, mock_select_tool_agent_class):
+        """Test that reaching the total tool call limit goes straight to generate_response_tool."""
+        mock_select_tool_agent = Mock()
+        mock_select_tool_agent_class.return_value = mock_select_tool_agent
+        
+        # One response that uses up the whole tool budget (10 calls, alternating tools)
+        mock_select_tool_agent.select_tool.side_effect = [
+            create_mock_tool_call_response(["get_tasks_tool", "create_tasks_tool"] * 5),
+        ]
+        
+        mock_agents = self._setup_mock_tool_agents()
+        self.agent.tool_agents = mock_agents
+        
+        result = self.agent.think("Create a bunch of tasks", None)
+        
+        self.assertIn("result", result)
+        self.assertEqual(mock_agents["get_tasks_tool"].execute_tool.call_count, 5)
+        self.assertEqual(mock_agents["create_tasks_tool"].execute_tool.call_count, 5)
+        self.assertEqual(mock_agents["generate_response_tool"].execute_tool.call_count, 1)
+        
+        # No second selector round-trip once the budget is exhausted
+        self.assertEqual(mock_select_tool_agent.select_tool.call_count, 1,
+                        "select_tool should not be called again after the tool limit is reached")
+
+    @patch('app.agents.general_thinking_agent.SelectToolAgent')
+    def test_think_batch_returns_results_in_input_order(self, mock_select_tool_agent_class):
+        """Test that think_batch processes every input and keeps results in input order."""
+        mock_select_tool_agent = Mock()
+        mock_select_tool_agent_class.return_value = mock_select_tool_agent
+        mock_select_tool_agent.select_tool.return_value = create_mock_tool_call_response("generate_response_tool")
+        
+        mock_agents = self._setup_mock_tool_agents()
+        mock_agents["generate_response_tool"].execute_tool.side_effect = (
+            lambda chat_history, user_config: f"Reply to: {chat_history[-1]['content']}"
+        )
+        self.agent.tool_agents = mock_agents
+        
+        inputs = [(f"Hello {i}", None, None) for i in range(5)]
+        results = self.agent.think_batch(inputs, max_concurrency=3)
+        
+        self.assertEqual([r["result"] for r in results], [f"Reply to: Hello {i}" for i in range(5)])
+        self.assertEqual(mock_agents["generate_response_tool"].execute_tool.call_count, 5)
+
+
+    @patch('app.agents.general_thinking_agent.SelectToolAgent')
+    def test_identical_consecutive_tool_responses_sent_to_selector_once(self, mock_select_tool_agent_class):
+        """Test that repeated identical tool responses are compacted for the selector but kept in chat_history."""
+        mock_select_tool_agent = Mock()
+        mock_select_tool_agent_class.return_value = mock_select_tool_agent
+        
+        mock_select_tool_agent.select_tool.side_effect = [
+            create_mock_tool_call_response(["get_tasks_tool", "get_tasks_tool"]),
+            create_mock_tool_call_response("generate_response_tool")
+        ]
+        
+        mock_agents = self._setup_mock_tool_agents()
+        self.agent.tool_agents = mock_agents
+        
+        result = self.agent.think("What are my tasks?", None)
+        
+        self.assertEqual(mock_agents["get_tasks_tool"].execute_tool.call_count, 2)
+        tool_turns = [m["name"] for m in result["chat_history"] if m.get("role") == "assistant"]
+        self.assertEqual(tool_turns, ["get_tasks_tool", "get_tasks_tool"])
+        
+        selector_history = mock_select_tool_agent.select_tool.call_args_list[1][0][0]
+        selector_tool_turns = [m["name"] for m in selector_history if m.get("role") == "assistant"]
+        self.assertEqual(selector_tool_turns, ["get_tasks_tool"])
+
+    @patch('app.agents.general_thinking_agent.SelectToolAgent')
+    def test_prebuilt_tool_agents_are_used_read_only(self, mock_select_tool_agent_class):
+        """Test that pre-built tool agents passed to __init__ are used and the registry can't be mutated."""
+        mock_select_tool_agent = Mock()
+        mock_select_tool_agent_class.return_value = mock_select_tool_agent
+        mock_select_tool_agent.select_tool.return_value = create_mock_tool_call_response("generate_response_tool")
+        
+        mock_agents = self._setup_mock_tool_agents()
+        agent = GeneralThinkingAgent(tool_agents=mock_agents.values())
+        
+        self.assertEqual(dict(agent.tool_agents), mock_agents)
+        with self.assertRaises(TypeError):
+            agent.tool_agents["generate_response_tool"] = Mock()
+        
+        result = agent.think("Hello", None)
+        
+        self.assertEqual(result["result"], "Test response")
+        mock_agents["generate_response_tool"].execute_tool.assert_called_once()
+
+    @patch('app.agents.general_thinking_agent.SelectToolAgent')
+    def test_speculative_generate_response_is_used_when_selected(self, mock_select_tool_agent_class):
+        """Test that a speculative generate_response_tool call is reused when the selector confirms it."""
+        mock_select_tool_agent = Mock()
+        mock_select_tool_agent_class.return_value = mock_select_tool_agent
+        
+        mock_select_tool_agent.select_tool.side_effect = [
+            create_mock_tool_call_response("get_tasks_tool"),
+            create_mock_tool_call_response("generate_response_tool")
+        ]
+        
+        mock_agents = self._setup_mock_tool_agents()
+        agent = GeneralThinkingAgent(tool_agents=mock_agents.values(), speculative_generate_response=True)
+        
+        result = agent.think("What are my tasks?", None)
+        
+        self.assertEqual(result["result"], "Test response")
+        self.assertEqual(mock_select_tool_agent.select_tool.call_count, 2)
+        # The speculative call is the only generate_response_tool call
+        mock_agents["generate_response_tool"].execute_tool.assert_called_once()
+        generate_history = mock_agents["generate_response_tool"].execute_tool.call_args[0][0]
+        self.assertEqual(generate_history, result["chat_history"])
+
+    @patch('app.agents.general_thinking_agent.SelectToolAgent')
+    def test_speculative_generate_response_is_discarded_when_mispredicted(self, mock_select_tool_agent_class):
+        """Test that a mispredicted speculative call is dropped and the final response sees every tool result."""
+        mock_select_tool_agent = Mock()
+        mock_select_tool_agent_class.return_value = mock_select_tool_agent
+        
+        mock_select_tool_agent.select_tool.side_effect = [
+            create_mock_tool_call_response("get_tasks_tool"),
+            create_mock_tool_call_response("edit_tasks_tool"),
+            create_mock_tool_call_response("generate_response_tool")
+        ]
+        
+        mock_agents = self._setup_mock_tool_agents()
+        final_histories = []
+        mock_agents["generate_response_tool"].execute_tool.side_effect = (
+            lambda chat_history, user_config: final_histories.append(list(chat_history)) or f"Reply after {chat_history[-1]['name']}"
+        )
+        agent = GeneralThinkingAgent(tool_agents=mock_agents.values(), speculative_generate_response=True)
+        
+        result = agent.think("Mark my medicine task as done", None)
         
+        self.assertEqual(result["result"], "Reply after edit_tasks_tool")
+        tool_turns = [m["name"] for m in result["chat_history"] if m.get("role") == "assistant"]
+        self.assertEqual(tool_turns, ["get_tasks_tool", "edit_tasks_tool"])
+        self.assertIn(result["chat_history"], final_histories)
 
 if __name__ == '__main__':
     unittest.main()
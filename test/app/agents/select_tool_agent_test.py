@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+# Add the app directory to the Python path to enable imports like "from database import ..."
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+sys.path.insert(0, os.path.join(project_root, 'app'))
+sys.path.insert(0, project_root)
+
+from app.agents.select_tool_agent import SelectToolAgent, _selection_response, select_model
+
+
+def create_mock_tool_agents(tool_names):
+    """Create mock tool agents exposing get_tool_name / get_tool_description."""
+    tool_agents = {}
+    for tool_name in tool_names:
+        tool_agent = Mock()
+        tool_agent.get_tool_name.return_value = tool_name
+        tool_agent.get_tool_description.return_value = f"Description for {tool_name}"
+        tool_agents[tool_name] = tool_agent
+    return tool_agents
+
+
+@patch('app.agents.select_tool_agent.gemini_response_to_openai_like', side_effect=lambda response: response)
+@patch('app.agents.select_tool_agent.call_gemini')
+class SelectToolAgentTest(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.agent = SelectToolAgent(create_mock_tool_agents(
+            ["get_tasks_tool", "create_tasks_tool", "edit_tasks_tool", "generate_response_tool"]
+        ))
+
+    def test_identical_chat_history_reuses_selection(self, mock_call_gemini, _):
+        """Test that selecting for the same chat history twice only calls the model once."""
+        mock_call_gemini.side_effect = [_selection_response("create_tasks_tool"), _selection_response("create_tasks_tool")]
+        chat_history = [{"role": "user", "content": "Remind me to call mom at 5pm and buy milk at 6pm"}]
+
+        first = self.agent.select_tool(chat_history)
+        second = self.agent.select_tool([dict(message) for message in chat_history])
+
+        self.assertIs(first, second)
+        self.assertEqual(mock_call_gemini.call_count, 1)
+        self.assertEqual(mock_call_gemini.call_args.kwargs["model"], select_model)
+
+    def test_changed_chat_history_calls_model_again(self, mock_call_gemini, _):
+        """Test that a chat history with a new tool response is not served from the cache."""
+        mock_call_gemini.side_effect = [_selection_response("create_tasks_tool"), _selection_response("create_tasks_tool")]
+        chat_history = [{"role": "user", "content": "Remind me to call mom at 5pm and buy milk at 6pm"}]
+
+        first = self.agent.select_tool(chat_history)
+        chat_history.append({"role": "assistant", "name": "create_tasks_tool", "content": '{"success": true, "task_id": "1"}'})
+        second = self.agent.select_tool(chat_history)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(mock_call_gemini.call_count, 2)
+
+    def test_selection_cache_is_bounded(self, mock_call_gemini, _):
+        """Test that the least recently used selection is evicted once the cache is full."""
+        mock_call_gemini.side_effect = lambda messages, tools, **kwargs: _selection_response("create_tasks_tool")
+        self.agent.SELECTION_CACHE_SIZE = 2
+
+        for content in ("one", "two", "three"):
+            self.agent.select_tool([{"role": "user", "content": content}])
+        self.agent.select_tool([{"role": "user", "content": "one"}])
+
+        self.assertEqual(len(self.agent._selection_cache), 2)
+        self.assertEqual(mock_call_gemini.call_count, 4)
+
+    def test_invalid_selection_is_not_cached(self, mock_call_gemini, _):
+        """Test that a response without a known tool name is returned but not reused for a retry."""
+        no_tool_calls = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="", tool_calls=None))])
+        mock_call_gemini.side_effect = [no_tool_calls, _selection_response("select_tool"), _selection_response("create_tasks_tool")]
+        chat_history = [{"role": "user", "content": "Remind me to call mom at 5pm and buy milk at 6pm"}]
+
+        self.assertIs(self.agent.select_tool(chat_history), no_tool_calls)
+        self.agent.select_tool(chat_history)
+        self.assertSelected(self.agent.select_tool(chat_history), "create_tasks_tool")
+        self.assertSelected(self.agent.select_tool(chat_history), "create_tasks_tool")
+
+        self.assertEqual(mock_call_gemini.call_count, 3)
+
+    def assertSelected(self, response, tool_name):
+        self.assertEqual(json.loads(response.choices[0].message.tool_calls[0].function.arguments), {"tool_name": tool_name})
+
+    def test_read_only_question_selects_get_tasks_without_model(self, mock_call_gemini, _):
+        """Test that a read-only task question goes to get_tasks_tool, then generate_response_tool."""
+        chat_history = [{"role": "user", "content": "What tasks do I have today?"}]
+        self.assertSelected(self.agent.select_tool(chat_history), "get_tasks_tool")
+
+        chat_history.append({"role": "assistant", "name": "get_tasks_tool", "content": '{"tasks": [], "total_count": 0}'})
+        self.assertSelected(self.agent.select_tool(chat_history), "generate_response_tool")
+        mock_call_gemini.assert_not_called()
+
+    def test_finished_tool_results_select_generate_response_without_model(self, mock_call_gemini, _):
+        """Test that edit results and final create_tasks statuses go straight to generate_response_tool."""
+        for name, content in (
+            ("edit_tasks_tool", '{"success": true, "task_id": "1"}'),
+            ("create_tasks_tool", '{"success": false, "status": "all_tasks_created"}'),
+        ):
+            chat_history = [
+                {"role": "user", "content": "Remind me to stretch at 5pm"},
+                {"role": "assistant", "name": name, "content": content},
+            ]
+            self.assertSelected(self.agent.select_tool(chat_history), "generate_response_tool")
+        mock_call_gemini.assert_not_called()
+
+    def test_write_requests_are_left_to_the_model(self, mock_call_gemini, _):
+        """Test that task changes and get_tasks lookups made for them still go to the model."""
+        mock_call_gemini.side_effect = lambda messages, tools, **kwargs: _selection_response("edit_tasks_tool")
+        self.agent.select_tool([{"role": "user", "content": "Delete my task for today"}])
+        self.agent.select_tool([
+            {"role": "user", "content": "Mark my reminder for today as done"},
+            {"role": "assistant", "name": "get_tasks_tool", "content": '{"tasks": [], "total_count": 0}'},
+        ])
+        self.assertEqual(mock_call_gemini.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
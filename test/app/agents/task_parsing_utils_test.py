@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# Add the app directory to the Python path to enable imports like "from database import ..."
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+sys.path.insert(0, os.path.join(project_root, 'app'))
+sys.path.insert(0, project_root)
+
+from app.agents.utils.task_parsing_utils import try_parse_task
+
+NOW = datetime(2026, 1, 24, 10, 15, 30, tzinfo=ZoneInfo("America/Los_Angeles"))
+
+
+class TaskParsingUtilsTest(unittest.TestCase):
+
+    def test_parses_clock_time_on_current_date(self):
+        """Test that a time with no day phrase, or with 'tonight', stays on the current date."""
+        self.assertEqual(
+            try_parse_task("Remind me to buy groceries at 6:30pm", NOW),
+            ("buy groceries", NOW.replace(hour=18, minute=30, second=0, microsecond=0)),
+        )
+        self.assertEqual(
+            try_parse_task("remind me to take out the trash tonight at 9 p.m.", NOW),
+            ("take out the trash", NOW.replace(hour=21, minute=0, second=0, microsecond=0)),
+        )
+
+    def test_parses_tomorrow(self):
+        """Test that 'tomorrow' before or after the time moves the task to the next date."""
+        expected = ("call mom", NOW.replace(day=25, hour=7, minute=0, second=0, microsecond=0))
+        self.assertEqual(try_parse_task("Create a task to call mom tomorrow at 7am", NOW), expected)
+        self.assertEqual(try_parse_task("create a task to call mom at 7 AM tomorrow.", NOW), expected)
+
+    def test_parses_relative_time(self):
+        """Test that 'in N minutes/hours' is resolved against now."""
+        self.assertEqual(
+            try_parse_task("remind me to stretch in 20 minutes", NOW),
+            ("stretch", NOW.replace(minute=35, second=30, microsecond=0)),
+        )
+        self.assertEqual(
+            try_parse_task("remind me to stretch in 2 hours", NOW),
+            ("stretch", NOW.replace(hour=12, microsecond=0)),
+        )
+
+    def test_leaves_ambiguous_requests_to_the_model(self):
+        """Test that multi-task, recurring, weekday and 24h-clock requests are not parsed."""
+        for message in (
+            "remind me to brush my teeth at 6am and eat breakfast at 11am",
+            "remind me to water the plants every day at 8am",
+            "remind me to call mom on friday at 7pm",
+            "remind me to call mom at 19:00",
+            "remind me to call mom at 7",
+            "remind me to call mom tomorrow at 7pm tonight",
+            "what are my tasks today",
+            "",
+        ):
+            self.assertIsNone(try_parse_task(message, NOW), message)
+
+
+if __name__ == '__main__':
+    unittest.main()
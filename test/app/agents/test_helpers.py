@@ -2,6 +2,7 @@
 Shared test utilities and mock data for agent tests.
 """
 import os
+from concurrent.futures import Future
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 
@@ -75,6 +76,34 @@ def create_enqueue_side_effect():
     return enqueue_side_effect
 
 
+def create_enqueue_tasks_side_effect():
+    """
+    Create a side effect function for mocking enqueue_tasks.
+    
+    Returns:
+        function: Side effect function that takes a list of task dicts (task_id, user_id,
+                  task_info, time_to_execute) and returns one mock enqueue result per task
+    """
+    def enqueue_tasks_side_effect(tasks):
+        return [
+            create_mock_enqueue_result(task_id=task["task_id"], scheduled_time=task["time_to_execute"])
+            for task in tasks
+        ]
+    return enqueue_tasks_side_effect
+
+
+def run_task_work_inline(task_ids, fn, *args, **kwargs):
+    """
+    Stand-in for submit_task_work that runs fn immediately.
+    
+    Returns:
+        Future: Already completed with fn's result
+    """
+    future = Future()
+    future.set_result(fn(*args, **kwargs))
+    return future
+
+
 def create_mock_task(
     task_id="test-task-1",
     user_id=None,
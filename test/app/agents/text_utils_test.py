@@ -0,0 +1,49 @@
+import unittest
+import sys
+import os
+
+# Add the app directory to the Python path to enable imports like "from database import ..."
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+sys.path.insert(0, os.path.join(project_root, 'app'))
+sys.path.insert(0, project_root)
+
+from app.agents.utils.text_utils import has_fragmentation, normalize_text, should_skip_fragmented_entry
+
+
+class TextUtilsTest(unittest.TestCase):
+
+    def test_has_fragmentation_detects_fragment_patterns(self):
+        """Test that each fragmentation signal is detected on its own."""
+        self.assertTrue(has_fragmentation("remind me  to eat"))
+        self.assertTrue(has_fragmentation("at 4 :00"))
+        self.assertTrue(has_fragmentation("at 4 p .m."))
+        self.assertTrue(has_fragmentation("ck my ra nge j acket"))
+        self.assertTrue(has_fragmentation("x"))
+
+    def test_has_fragmentation_ignores_clean_text(self):
+        """Test that normal sentences, 'a'/'I' and standalone numbers are not flagged."""
+        self.assertFalse(has_fragmentation("What are my tasks today?"))
+        self.assertFalse(has_fragmentation("I need a reminder at 4:00 p.m."))
+        self.assertFalse(has_fragmentation("remind me in 5 minutes"))
+        self.assertFalse(has_fragmentation("add ½ cup"))
+        self.assertFalse(has_fragmentation(""))
+
+    def test_normalize_text(self):
+        """Test that normalization lowercases and collapses whitespace."""
+        self.assertEqual(normalize_text("  Remind ME\tto  eat \n"), "remind me to eat")
+        self.assertEqual(normalize_text(""), "")
+        self.assertEqual(normalize_text(None), "")
+
+    def test_should_skip_fragmented_entry(self):
+        """Test that fragments of the final input are skipped and complete entries are kept."""
+        final = "pack my rain jacket"
+        final_normalized = normalize_text(final)
+        final_has_fragmentation = has_fragmentation(final)
+        self.assertTrue(should_skip_fragmented_entry("pa ck my r ain jacket", final_normalized, final_has_fragmentation))
+        self.assertTrue(should_skip_fragmented_entry("my  rain", final_normalized, final_has_fragmentation))
+        self.assertFalse(should_skip_fragmented_entry("what are my tasks", final_normalized, final_has_fragmentation))
+        self.assertFalse(should_skip_fragmented_entry("", final_normalized, final_has_fragmentation))
+
+
+if __name__ == '__main__':
+    unittest.main()
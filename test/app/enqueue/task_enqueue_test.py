@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+# Add the app directory to the Python path to enable imports like "from database import ..."
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+sys.path.insert(0, os.path.join(project_root, 'app'))
+sys.path.insert(0, project_root)
+
+from app.enqueue import task_enqueue
+from app.enqueue.task_enqueue import enqueue_tasks
+
+
+def _mock_sender():
+    """Return (client, sender) mocks shaped like ServiceBusClient / ServiceBusSender context managers."""
+    client = MagicMock()
+    sender = MagicMock()
+    client.__enter__.return_value = client
+    client.get_queue_sender.return_value.__enter__.return_value = sender
+    return client, sender
+
+
+@patch.object(task_enqueue, 'ServiceBusMessage', side_effect=lambda body: body)
+class EnqueueTasksTest(unittest.TestCase):
+
+    def test_failed_schedule_group_keeps_earlier_results(self, _):
+        """Test that a failing second schedule_messages call only fails the tasks it carried."""
+        client, sender = _mock_sender()
+        sender.schedule_messages.side_effect = [[101], ValueError("Service Bus unavailable")]
+        tasks = [
+            {"task_id": "task-1", "user_id": "user-1", "time_to_execute": "2030-01-01T09:00:00+00:00"},
+            {"task_id": "task-2", "user_id": "user-1", "time_to_execute": "2030-01-02T09:00:00+00:00"},
+        ]
+
+        with patch.object(task_enqueue, 'get_service_bus_client', return_value=client):
+            results = enqueue_tasks(tasks)
+
+        self.assertEqual(sender.schedule_messages.call_count, 2)
+        self.assertTrue(results[0]["success"])
+        self.assertEqual(results[0]["sequence_id"], 101)
+        self.assertFalse(results[1]["success"])
+        self.assertEqual(results[1]["task_id"], "task-2")
+        self.assertIsNone(results[1]["sequence_id"])
+        self.assertIn("Service Bus unavailable", results[1]["error"])
+
+    def test_invalid_time_only_fails_that_task(self, _):
+        """Test that a task with an unparseable time does not stop the others from being sent."""
+        client, sender = _mock_sender()
+        sender.schedule_messages.return_value = [202]
+        tasks = [
+            {"task_id": "task-1", "user_id": "user-1", "time_to_execute": "not a time"},
+            {"task_id": "task-2", "user_id": "user-1", "time_to_execute": "2030-01-02T09:00:00+00:00"},
+        ]
+
+        with patch.object(task_enqueue, 'get_service_bus_client', return_value=client):
+            results = enqueue_tasks(tasks)
+
+        self.assertFalse(results[0]["success"])
+        self.assertTrue(results[1]["success"])
+        self.assertEqual(results[1]["sequence_id"], 202)
+
+    def test_connection_failure_raises(self, _):
+        """Test that nothing is reported as sent when the client cannot be created."""
+        tasks = [{"task_id": "task-1", "user_id": "user-1", "time_to_execute": "2030-01-01T09:00:00+00:00"}]
+
+        with patch.object(task_enqueue, 'get_service_bus_client', side_effect=ValueError("not configured")):
+            with self.assertRaises(ValueError):
+                enqueue_tasks(tasks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add the app directory to the Python path to enable imports like "from database import ..."
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+sys.path.insert(0, os.path.join(project_root, 'app'))
+sys.path.insert(0, project_root)
+
+from app.enqueue.task_work_queue import submit_task_work
+
+
+class TaskWorkQueueTest(unittest.TestCase):
+
+    def test_work_for_the_same_task_runs_in_submission_order(self):
+        """Test that an edit submitted after a create waits for the create's enqueue to finish."""
+        release_create = threading.Event()
+        calls = []
+
+        def create():
+            release_create.wait(timeout=5)
+            calls.append("create")
+
+        create_future = submit_task_work(["task-1"], create)
+        edit_future = submit_task_work(["task-1"], calls.append, "edit")
+        other_future = submit_task_work(["task-2"], calls.append, "other")
+
+        other_future.result(timeout=5)
+        self.assertEqual(calls, ["other"])
+        release_create.set()
+        edit_future.result(timeout=5)
+
+        self.assertTrue(create_future.done())
+        self.assertEqual(calls, ["other", "create", "edit"])
+
+    def test_result_and_errors_are_returned_through_the_future(self):
+        """Test that fn's return value and exceptions come back on the returned future."""
+        self.assertEqual(submit_task_work(["task-3"], lambda: 42).result(timeout=5), 42)
+        failing = submit_task_work(["task-3"], lambda: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            failing.result(timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()